@@ -1,6 +1,7 @@
 from __future__ import absolute_import, division, print_function
 
 import logging
+import sys
 
 from dynd import nd
 from pandas import DataFrame
@@ -30,39 +31,40 @@ from .compute.core import compute
 from .sql import *
 from .server import *
 
-try:
-    from .spark import *
-except ImportError:
-    pass
-try:
-    from .compute.sparksql import *
-    from .sparksql import *
-except ImportError:
-    pass
-try:
-    from .compute.h5py import *
-except ImportError:
-    pass
-try:
-    from .compute.pytables import *
-except ImportError:
-    pass
+# Optional backends.  Importing one registers its dispatch implementations,
+# so each is loaded up front if its dependencies are installed.  Modules in a
+# group are loaded in order; a missing dependency skips the rest of the group.
+_OPTIONAL = [('.spark',),
+             ('.compute.sparksql', '.sparksql'),
+             ('.compute.h5py',),
+             ('.compute.pytables',),
+             ('.bcolz',),
+             ('.mongo',),
+             ('.pytables',)]
+
+
+def _load_optional(group):
+    """ Import the modules of ``group``, like ``from module import *`` """
+    for name in group:
+        try:
+            __import__(__name__ + name)
+        except ImportError:
+            return
+        mod = sys.modules[__name__ + name]
+        names = getattr(mod, '__all__',
+                        [n for n in dir(mod) if not n.startswith('_')])
+        globals().update((n, getattr(mod, n)) for n in names)
+
+
+for _group in _OPTIONAL:
+    _load_optional(_group)
+del _group
+
 try:
     import blaze.compute.chunks
 except ImportError:
     pass
-try:
-    from .bcolz import *
-except ImportError:
-    pass
-try:
-    from .mongo import *
-except ImportError:
-    pass
-try:
-    from .pytables import *
-except ImportError:
-    pass
+
 
 restart_ordering() # Restart multipledispatch ordering and do ordering
 
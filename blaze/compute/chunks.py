@@ -25,7 +25,7 @@ import itertools
 from ..expr import (Symbol, Head, Join, Selection, By, Label,
         ElemWise, ReLabel, Distinct, by, min, max, any, all, sum, count, mean,
         nunique)
-from .core import compute
+from .core import compute, FusedSelectElem
 from toolz import partition_all
 from collections import Iterator
 from toolz import concat, first
@@ -126,7 +126,7 @@ def compute_up(expr, c, **kwargs):
     return df
 
 
-@dispatch((Selection, ElemWise, Label, ReLabel), ChunkIterator)
+@dispatch((Selection, ElemWise, Label, ReLabel, FusedSelectElem), ChunkIterator)
 def compute_up(expr, c, **kwargs):
     return ChunkIterator(compute_up(expr, chunk) for chunk in c)
 
@@ -5,7 +5,7 @@ import toolz
 from toolz import first
 
 from ..compatibility import basestring
-from ..expr import Expr, Symbol, Symbol, eval_str, Union
+from ..expr import Expr, Symbol, Symbol, eval_str, Union, ElemWise, Selection
 from ..dispatch import dispatch
 
 __all__ = ['compute', 'compute_up']
@@ -169,10 +169,19 @@ def compute(expr, d, **kwargs):
     expr2, d2 = swap_resources_into_scope(expr, d)
 
     expr3 = pre_compute(expr2, d2)
+    leaves = [e for e in d2 if e in expr3]
+    # Optimizers see the terms we hold data for as opaque symbols, so that
+    # e.g. a Selection given in the scope isn't fused into its parent
+    bound = dict((e, Symbol('_%d' % i, e.dshape))
+                 for i, e in enumerate(leaves) if not isinstance(e, Symbol))
     try:
-        expr4 = optimize(expr3, *[v for e, v in d2.items() if e in expr3])
+        expr4 = optimize(expr3._subs(bound) if bound else expr3,
+                         *[d2[e] for e in leaves])
     except NotImplementedError:
         expr4 = expr3
+    else:
+        if bound:
+            expr4 = expr4._subs(dict((v, k) for k, v in bound.items()))
     result = top_to_bottom(d2, expr4, **kwargs)
     return post_compute(expr4, result, d2)
 
@@ -230,6 +239,62 @@ def columnwise_funcstr(t, variadic=True, full=False):
     return prefix % ', '.join(map(str, columns)) + eval_str(t._expr)
 
 
+class FusedSelectElem(Expr):
+    """ Elementwise operations applied to the output of a Selection
+
+    Produced by ``fuse_selections`` so that a backend can evaluate the
+    predicate and the elementwise operations in a single pass over the data.
+    ``apply`` is the original expression, rooted at
+    ``Selection(_child, predicate)``.
+
+    This is deliberately not an ``ElemWise``, so that other backends' rules
+    for ``ElemWise`` don't overlap with the Python backend's rule for it.
+    """
+    __slots__ = '_child', 'predicate', 'apply'
+
+    @property
+    def dshape(self):
+        return self.apply.dshape
+
+    @property
+    def _name(self):
+        return self.apply._name
+
+    def __str__(self):
+        return str(self.apply)
+
+
+def fuse_selections(expr):
+    """ Fuse chains of elementwise operations into the Selection below them
+
+    ``compute`` hands optimizers the terms bound in its scope as plain
+    symbols, so a Selection that already has data is never fused away.
+
+    >>> t = Symbol('t', 'var * {name: string, amount: int}')
+    >>> expr = fuse_selections(t[t.amount > 0].name)
+    >>> type(expr).__name__
+    'FusedSelectElem'
+    >>> expr._child
+    t
+    >>> expr.apply.isidentical(t[t.amount > 0].name)
+    True
+    """
+    inputs = [i for i in expr._inputs if isinstance(i, Expr)]
+    fused = [fuse_selections(i) for i in inputs]
+    changed = dict((a, b) for a, b in zip(inputs, fused) if a is not b)
+    if changed:
+        expr = expr._subs(changed)
+
+    if isinstance(expr, ElemWise):
+        child = expr._child
+        if isinstance(child, Selection):
+            return FusedSelectElem(child._child, child.predicate, expr)
+        if isinstance(child, FusedSelectElem):
+            return FusedSelectElem(child._child, child.predicate,
+                                   expr._subs({child: child.apply}))
+    return expr
+
+
 @dispatch(Union, (list, tuple))
 def compute_up(t, children, **kwargs):
     return compute_up(t, children[0], tuple(children))
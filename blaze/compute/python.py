@@ -18,14 +18,19 @@ import fnmatch
 import re
 from collections import Iterator
 from functools import partial
+from operator import itemgetter, attrgetter
 from toolz import map, filter, compose, juxt, identity
-from cytoolz import groupby, reduceby, unique, take, concat, first, nth
+from cytoolz import (groupby, reduceby, unique, concat, first, nth,
+                     partition_all)
 import cytoolz
 import toolz
 import sys
 import math
 import datetime
-from datashape import Record, Tuple
+import numpy as np
+import pandas as pd
+from datashape import Record, Tuple, DataShape, dshape
+from datashape import coretypes as ct
 from datashape.predicates import isscalar, iscollection
 
 from ..dispatch import dispatch
@@ -33,14 +38,17 @@ from ..expr import (Projection, Field, Broadcast, Map, Label, ReLabel,
                     Merge, Join, Selection, Reduction, Distinct,
                     By, Sort, Head, Apply, Union, Summary, Like,
                     DateTime, Date, Time, Millisecond, Symbol, ElemWise,
-                    Symbol, Slice)
+                    Symbol, Slice, Expr)
+from ..expr.core import Node, cached
 from ..expr import reductions
 from ..expr import count, nunique, mean, var, std
 from ..expr import eval_str
 from ..expr import BinOp, UnaryOp, RealMath
+from ..expr.arithmetic import (USub, Not, And, Or, Add, Sub, Mult, Div,
+                               FloorDiv, Pow, Mod, Relational)
 from ..compatibility import builtins, apply, unicode, _inttypes
 from . import core
-from .core import compute, compute_up
+from .core import compute, compute_up, FusedSelectElem, fuse_selections
 
 from ..data import DataDescriptor
 from ..data.utils import listpack
@@ -49,12 +57,71 @@ from ..data.utils import listpack
 import math
 from math import *
 
+# numba takes a while to import, so it is only loaded by ``_load_numba``
+# once a sequence is long enough to need it.  ``None`` if not installed.
+numba = False
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
 
 __all__ = ['compute', 'compute_up', 'Sequence', 'rowfunc', 'rrowfunc']
 
 Sequence = (tuple, list, Iterator, type(dict().items()))
 
 
+# Functions built by ``rowfunc``/``rrowfunc`` are pure functions of the
+# expression.  Reuse them across calls (e.g. once per chunk) rather than
+# re-dispatching and re-``eval``ing them.  Keyed by ``_structural_key``.
+_rowfunc_cache = dict()
+ROWFUNC_CACHE_SIZE = 1000
+
+
+def _structural_key(o):
+    """ Hashable key that is equal only for identical expressions
+
+    Expressions themselves make poor keys: ``==`` on them builds an ``Eq``
+    node, and constants like ``1`` and ``1.0`` compare equal.  The key
+    holds the type of every node and constant instead.
+
+    >>> x = Symbol('x', 'int64')
+    >>> _structural_key(x + 1) == _structural_key(x + 1)
+    True
+    >>> _structural_key(x + 1) == _structural_key(x + 1.0)
+    False
+    """
+    if isinstance(o, Node):
+        return cached(o, '_structural_key',
+                      lambda e: (type(e),) + tuple(map(_structural_key,
+                                                       e._args)))
+    if isinstance(o, (tuple, list)):
+        return (type(o),) + tuple(map(_structural_key, o))
+    return (type(o), o)
+
+
+def _memo(cache, exprs, build):
+    """ Look up ``exprs``, a tuple of expressions, in ``cache`` or store
+    ``build()`` there """
+    key = tuple(map(_structural_key, exprs))
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    except TypeError:  # unhashable arguments somewhere in the expression
+        return build()
+    if len(cache) >= ROWFUNC_CACHE_SIZE:
+        cache.clear()
+    result = cache[key] = build()
+    return result
+
+
 def recursive_rowfunc(t, stop):
     """ Compose rowfunc functions up a tree
 
@@ -67,11 +134,14 @@ def recursive_rowfunc(t, stop):
     101
 
     """
-    funcs = []
-    while not t.isidentical(stop):
-        funcs.append(rowfunc(t))
-        t = t._child
-    return compose(*funcs)
+    def build():
+        funcs = []
+        u = t
+        while not u.isidentical(stop):
+            funcs.append(rowfunc(u))
+            u = u._child
+        return compose(*funcs)
+    return _memo(_rowfunc_cache, (t, stop), build)
 
 
 rrowfunc = recursive_rowfunc
@@ -103,12 +173,15 @@ def rowfunc(t):
 
 @dispatch(Field)
 def rowfunc(t):
-    index = t._child.fields.index(t._name)
-    return lambda x: x[index]
+    return itemgetter(t._child.fields.index(t._name))
 
 
 @dispatch(Broadcast)
 def rowfunc(t):
+    return _memo(_rowfunc_cache, (t,), partial(_broadcast_rowfunc, t))
+
+
+def _broadcast_rowfunc(t):
     if sys.version_info[0] == 3:
         # Python3 doesn't allow argument unpacking
         # E.g. ``lambda (x, y, z): x + z`` is illegal
@@ -134,7 +207,7 @@ def rowfunc(t):
 
 @dispatch(DateTime)
 def rowfunc(t):
-    return lambda row: getattr(row, t.attr)
+    return attrgetter(t.attr)
 
 
 @dispatch((Date, Time))
@@ -176,25 +249,592 @@ def deepmap(func, data, n=1):
     else:
         return map(compose(tuple, partial(deepmap, func, n=n-1)), data)
 
+def _gather_indices(expr, child):
+    """ Positions in rows of ``child`` read by a Field/Projection ``expr``
+
+    Returns ``None`` if ``expr`` computes anything beyond picking fields.
+
+    >>> accounts = Symbol('accounts', 'var * {name: string, amount: int}')
+    >>> _gather_indices(accounts[['amount', 'name']], accounts)
+    [1, 0]
+    """
+    while isinstance(expr, (Label, ReLabel)):
+        expr = expr._child
+    if not isinstance(expr, (Field, Projection)) or \
+            not expr._child.isidentical(child):
+        return None
+    names = [expr._name] if isinstance(expr, Field) else expr.fields
+    return [child.fields.index(name) for name in names]
+
+
 @dispatch(Merge)
 def rowfunc(t):
+    indices = [_gather_indices(_child, t._child) for _child in t.children]
+    if builtins.all(ind is not None for ind in indices):
+        # Statically known layout: one gather instead of a call per child
+        from cytoolz.curried import get
+        return get(list(concat(indices)))
     funcs = [rrowfunc(_child, t._child) for _child in t.children]
     return compose(concat_maybe_tuples, juxt(*funcs))
 
 
+# Concrete sequences at least this long are handed to vectorized kernels.
+# Shorter ones stay on the row-at-a-time path where setup costs dominate.
+VECTORIZE_THRESHOLD = 1000
+
+
+def _numpy_dtype(ds):
+    """ NumPy dtype used to vectorize a scalar datashape
+
+    Integers and floats are widened to 64 bits to stay close to Python
+    arithmetic.  Returns ``None`` for non-numeric types.
+
+    >>> _numpy_dtype(dshape('int32'))
+    dtype('int64')
+    >>> _numpy_dtype(dshape('string')) is None
+    True
+    """
+    if isinstance(ds, DataShape):
+        if ds.shape:
+            return None
+        ds = ds.measure
+    if not isinstance(ds, ct.CType):
+        return None
+    kind = ds.to_numpy_dtype().kind
+    if kind == 'b':
+        return np.dtype(bool)
+    if kind in 'iu':
+        return np.dtype('int64')
+    if kind == 'f':
+        return np.dtype('float64')
+    return None
+
+
+# Largest magnitude of an int64
+_int64_max = 2 ** 63 - 1
+
+
+def _magnitude(arr):
+    """ Largest absolute value in an integer array, as a Python int """
+    if not len(arr):
+        return 0
+    return builtins.max(abs(int(arr.min())), abs(int(arr.max())))
+
+
+def _int_bound(expr, bounds):
+    """ Bound on the magnitude of the integer values of scalar ``expr``
+
+    ``bounds`` maps symbol names to the largest magnitude in their integer
+    or boolean columns.  Returns ``None`` for float valued expressions.
+    Raises ``OverflowError`` where int64 arithmetic might wrap around,
+    which Python integers never do.
+
+    >>> x = Symbol('x', 'int64')
+    >>> _int_bound(x * x + 1, {'x': 1000})
+    1000001
+    >>> _int_bound(x / 2, {'x': 1000}) is None
+    True
+    """
+    if isinstance(expr, Symbol):
+        return bounds.get(expr._name)
+    if isinstance(expr, (bool, _inttypes)):
+        return abs(expr)
+    if isinstance(expr, numbers.Real) or not isinstance(expr, Expr):
+        return None
+    if isinstance(expr, BinOp):
+        lhs = _int_bound(expr.lhs, bounds)
+        rhs = _int_bound(expr.rhs, bounds)
+        if isinstance(expr, Relational):
+            return 1
+        if isinstance(expr, Pow) and lhs is not None:
+            if not isinstance(expr.rhs, _inttypes) or expr.rhs < 0:
+                raise OverflowError("Can not bound %s" % expr)
+            result = lhs ** expr.rhs
+        elif lhs is None or rhs is None or isinstance(expr, Div):
+            return None
+        elif isinstance(expr, (Add, Sub)):
+            result = lhs + rhs
+        elif isinstance(expr, Mult):
+            result = lhs * rhs
+        elif isinstance(expr, FloorDiv):
+            result = lhs
+        elif isinstance(expr, Mod):
+            result = rhs
+        elif isinstance(expr, (And, Or)):
+            result = builtins.max(lhs, rhs)
+        else:
+            raise OverflowError("Can not bound %s" % expr)
+    elif isinstance(expr, (USub, Not)):
+        result = _int_bound(expr._child, bounds)
+        if result is None:
+            return None
+        result += 1
+    else:
+        for child in expr._inputs:
+            _int_bound(child, bounds)
+        return None
+    if result > _int64_max:
+        raise OverflowError("%s may overflow int64" % expr)
+    return result
+
+
+def _check_int64(expr, inputs):
+    """ Raise ``OverflowError`` if Broadcast ``expr`` might wrap around on
+    the arrays ``inputs``, a dict keyed by active column """
+    bounds = dict((name, _magnitude(x)) for name, x in inputs.items()
+                  if x.dtype.kind in 'biu')
+    if bounds:
+        _int_bound(expr._expr, bounds)
+
+
+def _load_numba():
+    """ Import numba on first use, or return ``None`` if not installed """
+    global numba
+    if numba is False:
+        try:
+            import numba
+        except ImportError:
+            numba = None
+    return numba
+
+
+# Compiled kernels, keyed by ``_structural_key`` like the rowfunc cache.
+# A ``None`` kernel marks something numba could not compile.
+_kernels = dict()
+
+
+def _build_kernel(t):
+    func = t.func if isinstance(t, Map) else eval(
+        core.columnwise_funcstr(t, variadic=True))
+    try:
+        return numba.vectorize(nopython=True)(func)
+    except Exception:
+        return None
+
+
+def _jit_kernel(t):
+    """ Numba-compiled vectorized version of ``rowfunc(t)``
+
+    Operates on whole columns rather than on individual rows.  Returns
+    ``None`` if numba is not installed or can not compile ``t``.
+    """
+    if _load_numba() is None:
+        return None
+    return _memo(_kernels, (t,), partial(_build_kernel, t))
+
+
+def _kernel_failed(t):
+    try:
+        _kernels[(_structural_key(t),)] = None
+    except TypeError:
+        pass
+
+
+def _int_division(expr, inputs):
+    """ Whether Broadcast ``expr`` may use ``//`` or ``%`` on integers
+
+    Numba kernels return 0 for integer division by zero rather than
+    raising like Python does.
+    """
+    return (builtins.any(x.dtype.kind in 'biu' for x in inputs) and
+            builtins.any(isinstance(node, (FloorDiv, Mod))
+                         for node in expr._expr._subterms()))
+
+
+# Binary operators and functions that numexpr evaluates like NumPy does
+_numexpr_binops = frozenset(['+', '-', '*', '/', '==', '!=', '<', '<=', '>',
+                             '>=', '&', '|'])
+_numexpr_funcs = {'sqrt': 'sqrt', 'sin': 'sin', 'sinh': 'sinh', 'cos': 'cos',
+                  'cosh': 'cosh', 'tan': 'tan', 'tanh': 'tanh', 'exp': 'exp',
+                  'expm1': 'expm1', 'log': 'log', 'log10': 'log10',
+                  'log1p': 'log1p', 'acos': 'arccos', 'acosh': 'arccosh',
+                  'asin': 'arcsin', 'asinh': 'arcsinh', 'atan': 'arctan',
+                  'atanh': 'arctanh'}
+
+
+def _numexpr_source(expr):
+    """ numexpr source of the scalar expression ``expr``
+
+    Raises ``NotImplementedError`` for anything numexpr can not evaluate
+    with NumPy semantics.
+
+    >>> x = Symbol('x', 'real')
+    >>> _numexpr_source(2 * x + 1)
+    '((2 * x) + 1)'
+    """
+    if isinstance(expr, Symbol) and re.match(r'^[A-Za-z_]\w*$', expr._name):
+        return expr._name
+    if isinstance(expr, (bool, numbers.Real)):
+        return repr(expr)
+    if isinstance(expr, BinOp) and expr.symbol in _numexpr_binops:
+        return '(%s %s %s)' % (_numexpr_source(expr.lhs), expr.symbol,
+                               _numexpr_source(expr.rhs))
+    if isinstance(expr, (USub, Not)) and not _bool_unary(expr):
+        return '(%s%s)' % ('-' if isinstance(expr, USub) else '~',
+                           _numexpr_source(expr._child))
+    if isinstance(expr, RealMath) and type(expr).__name__ in _numexpr_funcs:
+        return '%s(%s)' % (_numexpr_funcs[type(expr).__name__],
+                           _numexpr_source(expr._child))
+    raise NotImplementedError()
+
+
+# numexpr sources of Broadcast expressions, keyed by ``_structural_key``.
+# A ``None`` source marks an expression numexpr can not evaluate.
+_numexpr_sources = dict()
+
+
+def _numexpr_broadcast_source(t):
+    try:
+        return _numexpr_source(t._expr)
+    except NotImplementedError:
+        return None
+
+
+def _numexpr_evaluate(t, inputs):
+    """ Evaluate Broadcast ``t`` with numexpr, or return ``None``
+
+    ``inputs`` maps active columns to arrays.  numexpr compiles each source
+    once and evaluates it multi-threaded in cache-sized blocks.  It doesn't
+    report floating point errors, so non-finite results are left to the
+    NumPy path, which raises where Python would.  Integers are evaluated
+    in int64, so expressions that might overflow are refused too.
+    """
+    if numexpr is None:
+        return None
+    source = _memo(_numexpr_sources, (t,),
+                   partial(_numexpr_broadcast_source, t))
+    if source is None or builtins.any(x.dtype == object
+                                      for x in inputs.values()):
+        return None
+    try:
+        _check_int64(t, inputs)
+    except OverflowError:
+        return None
+    try:
+        result = numexpr.evaluate(source, local_dict=inputs, truediv=True)
+    except Exception:
+        return None
+    if result.dtype.kind == 'f' and not np.isfinite(result).all():
+        return None
+    return result
+
+
+def _bool_unary(expr):
+    """ Whether scalar ``expr`` negates booleans with ``~`` or ``-``
+
+    Python treats booleans as integers here, e.g. ``~True == -2``, while
+    NumPy, numba and numexpr stay boolean.
+
+    >>> x = Symbol('x', 'int64')
+    >>> _bool_unary(~(x > 0))
+    True
+    >>> _bool_unary(~x)
+    False
+    """
+    return builtins.any(isinstance(node, (Not, USub)) and
+                        _numpy_dtype(node._child.dshape) == np.dtype(bool)
+                        for node in expr._subterms())
+
+
+def _isstring(ds):
+    if isinstance(ds, DataShape):
+        if ds.shape:
+            return False
+        ds = ds.measure
+    return isinstance(ds, ct.String)
+
+
+# Python types stored exactly by each kind of ``_numpy_dtype``
+_exact = {'b': (bool, np.bool_),
+          'i': _inttypes + (np.integer,),
+          'f': (float, np.floating)}
+
+
+def _exact_types(items, dtype):
+    """ Whether ``items`` come back unchanged from an array of ``dtype``
+
+    E.g. ints stored in a float column would come back as floats, and
+    floats in an int column would be truncated.
+
+    >>> _exact_types([1, 2], np.dtype('int64'))
+    True
+    >>> _exact_types([1, 2.5], np.dtype('int64'))
+    False
+    """
+    types = _exact[dtype.kind]
+    return builtins.all(issubclass(typ, types) and
+                        not (dtype.kind == 'i' and issubclass(typ, bool))
+                        for typ in set(map(type, items)))
+
+
+def _to_soa(seq, measure, names=None):
+    """ Convert a sequence of records into typed NumPy columns
+
+    Returns a dict mapping field name to array, converting only the fields
+    in ``names`` (defaults to all of them).  Numeric fields become 64 bit
+    arrays, strings become object arrays.  Sequences of scalars become a
+    single array.  Returns ``None`` if the data can not be represented this
+    way, e.g. because of missing values or nested data.
+
+    >>> ds = dshape('{name: string, amount: int}')
+    >>> _to_soa([('Alice', 100), ('Bob', 200)], ds.measure)['amount']
+    array([100, 200])
+    """
+    n = len(seq)
+
+    def column(ds, items):
+        dtype = _numpy_dtype(ds)
+        if dtype is not None:
+            items = list(items)
+            if not _exact_types(items, dtype):
+                raise TypeError("Values don't round-trip through %s" % dtype)
+            return np.fromiter(items, dtype, count=n)
+        if _isstring(ds):
+            result = np.empty(n, dtype=object)
+            result[:] = list(items)
+            return result
+        raise TypeError("Can not vectorize datashape %s" % ds)
+
+    try:
+        if not isinstance(measure, Record):
+            return column(measure, seq)
+        fields = measure.names
+        types = measure.dict
+        if names is None:
+            names = fields
+        return dict((name, column(types[name],
+                                  map(itemgetter(fields.index(name)), seq)))
+                    for name in names)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _from_soa(result, fields):
+    """ Turn the output of ``_compute_soa`` back into Python values """
+    if isinstance(result, dict):
+        return list(zip(*[result[name].tolist() for name in fields]))
+    return result.tolist()
+
+
+def _soa_fields(expr, child):
+    """ Fields of ``child`` read by the elementwise expression ``expr`` """
+    fields = set()
+    for node in expr._subterms():
+        if isinstance(node, Merge) or node.isidentical(child):
+            continue
+        parent = getattr(node, '_child', None)
+        if parent is None or not parent.isidentical(child):
+            continue
+        if isinstance(node, Field):
+            fields.add(node._name)
+        elif isinstance(node, Projection):
+            fields.update(node.fields)
+        elif isinstance(node, Broadcast):
+            fields.update(node.active_columns())
+        else:
+            return child.fields
+    return [name for name in child.fields if name in fields]
+
+
+def _compute_soa(expr, child, cols):
+    """ Compute elementwise ``expr`` on the columns ``cols`` of ``child``
+
+    ``cols`` is a dict of arrays for record data and a single array
+    otherwise, see ``_to_soa``.  Results follow the same convention.
+    Raises ``NotImplementedError`` for expressions we can not vectorize.
+    """
+    if expr.isidentical(child):
+        return cols
+    if isinstance(expr, Merge):
+        result = dict()
+        for c in expr.children:
+            value = _compute_soa(c, child, cols)
+            if isinstance(value, dict):
+                result.update(value)
+            else:
+                result[c._name] = value
+        return result
+    if not isinstance(expr, (Field, Projection, Label, ReLabel, Broadcast,
+                             Map)):
+        raise NotImplementedError()
+
+    parent = _compute_soa(expr._child, child, cols)
+    if isinstance(expr, Label):
+        return parent
+    if isinstance(expr, ReLabel):
+        labels = dict(expr.labels)
+        return dict((labels.get(k, k), v) for k, v in parent.items())
+    if isinstance(expr, Field):
+        return parent[expr._name]
+    if isinstance(expr, Projection):
+        return dict((name, parent[name]) for name in expr.fields)
+    if isinstance(expr, Broadcast):
+        if _bool_unary(expr._expr):
+            raise NotImplementedError()
+        inputs = [parent[c] for c in expr.active_columns()]
+        _check_int64(expr, dict(zip(expr.active_columns(), inputs)))
+    elif isinstance(parent, dict):
+        inputs = [parent[c] for c in expr._child.fields]
+    else:
+        inputs = [parent]
+
+    if isinstance(expr, Map):
+        # Arbitrary functions of integers may overflow int64, and integer
+        # results may have been truncated, so only trust floats and bools
+        kernel = _jit_kernel(expr)
+        if kernel is None or not builtins.all(x.dtype.kind in 'bf'
+                                              for x in inputs):
+            raise NotImplementedError()
+        try:
+            result = kernel(*inputs)
+        except Exception:
+            _kernel_failed(expr)
+            raise NotImplementedError()
+        if result.dtype.kind not in 'bf':
+            raise NotImplementedError()
+        return result
+
+    kernel = _jit_kernel(expr)
+    if (kernel is not None and builtins.all(x.dtype != object for x in inputs)
+            and not _int_division(expr, inputs)):
+        try:
+            return kernel(*inputs)
+        except Exception:
+            _kernel_failed(expr)
+    result = _numexpr_evaluate(expr, dict((c, parent[c])
+                                          for c in expr.active_columns()))
+    if result is not None:
+        return result
+    if (numexpr is not None and isinstance(expr._expr, (And, Or)) and
+            isinstance(expr._expr.lhs, Expr) and
+            isinstance(expr._expr.rhs, Expr)):
+        # Split boolean combinations so that, e.g., numeric comparisons go
+        # through numexpr even when combined with comparisons on strings
+        lhs = _compute_soa(Broadcast(expr._child, expr._expr.lhs), child, cols)
+        rhs = _compute_soa(Broadcast(expr._child, expr._expr.rhs), child, cols)
+        return expr._expr.op(lhs, rhs)
+    scope = dict((expr._child[c]._expr, parent[c])
+                 for c in expr.active_columns())
+    return compute(expr._expr, scope)
+
+
+_soa_types = Field, Projection, Broadcast, Map, Merge
+
+
+def _vectorize(t, seq, *exprs):
+    """ Compute ``exprs``, elementwise expressions on ``t._child``, on all
+    of ``seq`` at once
+
+    Returns a list of results, or ``None`` when this isn't possible or
+    worthwhile, in which case the caller should fall back to row-at-a-time
+    computation.
+    """
+    if not (isinstance(seq, (tuple, list))
+            and len(seq) >= VECTORIZE_THRESHOLD
+            and t._child.ndim == 1):
+        return None
+    if builtins.any(isinstance(e, Map) and _jit_kernel(e) is None
+                    for e in exprs):
+        return None
+    names = set(concat(_soa_fields(e, t._child) for e in exprs))
+    cols = _to_soa(seq, t._child.dshape.measure,
+                   [name for name in t._child.fields if name in names])
+    if cols is None:
+        return None
+    try:
+        # Raise rather than silently produce inf/nan where Python would
+        # raise, so that the row-wise fallback reports the error
+        with np.errstate(divide='raise', over='raise', invalid='raise'):
+            results = [_compute_soa(e, t._child, cols) for e in exprs]
+    except Exception:
+        return None
+    if builtins.all(isinstance(r, (np.ndarray, dict)) for r in results):
+        return results
+
+
+def _ismask(x):
+    return isinstance(x, np.ndarray) and x.dtype == bool
+
+
+# Rows of an iterator vectorized at a time, see ``_chunked``
+CHUNK_SIZE = 4096
+
+
+def _chunked(func, t, seq):
+    """ Lazily compute ``func(t, chunk)`` on chunks of ``seq`` and
+    concatenate the results
+
+    Gives iterators, e.g. from data descriptors, batches large enough to
+    vectorize without realizing all of them at once.
+    """
+    return concat(map(partial(func, t), partition_all(CHUNK_SIZE, seq)))
+
+
+def _streams(t, seq):
+    return isinstance(seq, Iterator) and t._child.ndim == 1
+
+
+def _compute_elemwise(t, seq):
+    result = _vectorize(t, seq, t)
+    if result is not None:
+        return _from_soa(result[0], t.fields)
+    return deepmap(rowfunc(t), seq, n=t._child.ndim)
+
+
 @dispatch(ElemWise, Sequence)
 def compute_up(t, seq, **kwargs):
-    func = rowfunc(t)
     if iscollection(t._child.dshape):
-        return deepmap(func, seq, n=t._child.ndim)
+        if isinstance(t, _soa_types):
+            if _streams(t, seq):
+                return _chunked(_compute_elemwise, t, seq)
+            return _compute_elemwise(t, seq)
+        return deepmap(rowfunc(t), seq, n=t._child.ndim)
     else:
-        return func(seq)
+        return rowfunc(t)(seq)
+
+
+def _compute_selection(t, seq):
+    result = _vectorize(t, seq, t.predicate)
+    if result is not None and _ismask(result[0]):
+        return list(map(seq.__getitem__, np.flatnonzero(result[0]).tolist()))
+    predicate = rrowfunc(t.predicate, t._child)
+    return filter(predicate, seq)
 
 
 @dispatch(Selection, Sequence)
 def compute_up(t, seq, **kwargs):
+    if _streams(t, seq):
+        return _chunked(_compute_selection, t, seq)
+    return _compute_selection(t, seq)
+
+
+def _compute_fused(t, seq):
+    selection = Selection(t._child, t.predicate)
+    elem = t.apply._subs({selection: t._child})
+
+    result = _vectorize(t, seq, t.predicate, elem)
+    if result is not None and _ismask(result[0]):
+        mask, values = result
+        if isinstance(values, dict):
+            values = dict((k, v[mask]) for k, v in values.items())
+        else:
+            values = values[mask]
+        return _from_soa(values, t.fields)
+
     predicate = rrowfunc(t.predicate, t._child)
-    return filter(predicate, seq)
+    return map(rrowfunc(elem, t._child), filter(predicate, seq))
+
+
+@dispatch(FusedSelectElem, Sequence)
+def compute_up(t, seq, **kwargs):
+    if _streams(t, seq):
+        return _chunked(_compute_fused, t, seq)
+    return _compute_fused(t, seq)
+
+
+@dispatch(Expr, (list, tuple))
+def optimize(expr, seq):
+    return fuse_selections(expr)
 
 
 @dispatch(Reduction, Sequence)
@@ -229,7 +869,38 @@ def compute_up(f, n, **kwargs):
     return getattr(math, type(f).__name__)(n)
 
 
+def _as_array(seq, dtype, exact=False):
+    """ ``seq`` as an array of ``dtype`` if it is concrete and large enough to
+    be worth converting, otherwise ``None``
+
+    Arrays are returned as they are.  Iterators are left alone, converting
+    them would consume them.  With ``exact``, values that would change in
+    the conversion, like floats in an int array, give ``None`` too.
+
+    >>> _as_array(list(range(VECTORIZE_THRESHOLD)), 'f8').dtype
+    dtype('float64')
+    >>> _as_array([1, 2, 3], 'f8') is None
+    True
+    >>> _as_array([0.5] * VECTORIZE_THRESHOLD, 'i8', exact=True) is None
+    True
+    """
+    if isinstance(seq, np.ndarray):
+        return seq
+    if (dtype is not None and isinstance(seq, (tuple, list)) and
+            len(seq) >= VECTORIZE_THRESHOLD):
+        if exact and not _exact_types(seq, np.dtype(dtype)):
+            return None
+        try:
+            return np.fromiter(seq, dtype, count=len(seq))
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+
 def _mean(seq):
+    arr = _as_array(seq, 'f8')
+    if arr is not None:
+        return float(arr.mean())
+
     total = 0
     count = 0
     for item in seq:
@@ -238,16 +909,54 @@ def _mean(seq):
     return float(total) / count
 
 
+def _var_loop(arr, ddof):
+    """ Two-pass variance of an array, without the temporaries of ``var`` """
+    n = arr.shape[0]
+    total = 0.0
+    for i in range(n):
+        total += arr[i]
+    mean = total / n
+    m2 = 0.0
+    for i in range(n):
+        delta = arr[i] - mean
+        m2 += delta * delta
+    return m2 / (n - ddof)
+
+
+_var_nb = False
+
+
+def _var_kernel():
+    """ ``_var_loop`` compiled by numba on first use, or ``None`` """
+    global _var_nb
+    if _var_nb is False:
+        _var_nb = (numba.njit(nogil=True)(_var_loop)
+                   if _load_numba() is not None else None)
+    return _var_nb
+
+
 def _var(seq, unbiased):
-    total = 0
-    total_squared = 0
+    arr = _as_array(seq, 'f8')
+    if arr is not None:
+        kernel = _var_kernel()
+        if kernel is not None:
+            try:
+                return float(kernel(arr, int(unbiased)))
+            except Exception:
+                pass
+        return float(arr.var(ddof=int(unbiased)))
+
+    # Welford's online algorithm, stable where sum-of-squares cancels badly
     count = 0
+    mean = 0.0
+    m2 = 0.0
     for item in seq:
-        total += item
-        total_squared += item * item
         count += 1
+        delta = item - mean
+        mean += delta / count
+        m2 += delta * (item - mean)
 
-    return (total_squared - (total * total) / count) / (count - unbiased)
+    return m2 / (count - unbiased)
 
 
 def _std(seq, unbiased):
@@ -256,6 +965,9 @@ def _std(seq, unbiased):
 
 @dispatch(count, Sequence)
 def compute_up_1d(t, seq, **kwargs):
+    arr = _as_array(seq, _numpy_dtype(t._child.dshape.measure), exact=True)
+    if arr is not None:
+        return int(np.count_nonzero(arr))
     return cytoolz.count(filter(None, seq))
 
 
@@ -275,6 +987,12 @@ def compute_up(t, seq, **kwargs):
 
 @dispatch(nunique, Sequence)
 def compute_up_1d(t, seq, **kwargs):
+    dtype = _numpy_dtype(t._child.dshape.measure)
+    if dtype is not None and dtype.kind in 'biu':
+        # Hash machine integers in C rather than building a set of objects
+        arr = _as_array(seq, dtype, exact=True)
+        if arr is not None:
+            return len(pd.unique(arr))
     return len(set(seq))
 
 
@@ -315,6 +1033,16 @@ binops = {reductions.sum: (add, add, 0),
           reductions.all: (and_, and_, True)}
 
 
+# Vectorized counterparts of ``binops``: Reduction : ufunc
+# ``count`` is an ``add`` over ones
+binops_vec = {reductions.sum: np.add,
+              reductions.min: np.minimum,
+              reductions.max: np.maximum,
+              reductions.count: np.add,
+              reductions.any: np.logical_or,
+              reductions.all: np.logical_and}
+
+
 def reduce_by_funcs(t):
     """ Create grouping func and binary operator for a by-reduction/summary
 
@@ -366,14 +1094,113 @@ def reduce_by_funcs(t):
         return grouper, binop2, combiner, tuple(inits)
 
 
+def _factorize(keys, names):
+    """ Integer group ids for an array, or dict of arrays, of keys
+
+    Returns ``codes``, numbering groups in order of first appearance, and
+    the Python keys of those groups.  Hashes each key column once with
+    ``pd.factorize``.  Multi-column codes are combined pairwise and
+    refactorized to keep them small.  Raises ``ValueError`` for missing
+    keys like NaN or None, which ``pd.factorize`` doesn't number.
+
+    >>> codes, uniques = _factorize(np.array([3, 1, 3, 2]), ['x'])
+    >>> codes.tolist(), uniques
+    ([0, 1, 0, 2], [3, 1, 2])
+    """
+    def factorize(col):
+        codes, uniques = pd.factorize(col, sort=False)
+        if len(codes) and codes.min() < 0:
+            raise ValueError("Missing values in keys")
+        return codes, uniques
+
+    if not isinstance(keys, dict):
+        codes, _ = factorize(keys)
+        columns = [keys]
+    else:
+        columns = [keys[name] for name in names]
+        codes, uniques = factorize(columns[0])
+        for col in columns[1:]:
+            c, u = factorize(col)
+            codes, uniques = pd.factorize(codes.astype('i8') * len(u) + c,
+                                          sort=False)
+
+    # Codes count up from 0 in order of appearance, so the first index of
+    # each unique code, in sorted order, is the first row of each group
+    _, first = np.unique(codes, return_index=True)
+
+    if len(columns) == 1:
+        return codes, columns[0][first].tolist()
+    else:
+        return codes, list(zip(*[col[first].tolist() for col in columns]))
+
+
+def _reduce_by_soa(t, seq):
+    """ Vectorized by-reduction/summary over typed columns
+
+    Keys are factorized once into integer group ids, shared by all of the
+    reductions.  Counts and float sums are a single ``np.bincount``.  Other
+    reductions are a ``ufunc.reduceat`` from ``binops_vec`` over the values
+    sorted by group.  Returns a dict mapping group keys to reduced values,
+    like ``reduceby``, or ``None`` if ``t`` or ``seq`` can not be
+    vectorized.
+
+    See Also:
+        compute_up(By, Sequence)
+    """
+    if isinstance(t.apply, Summary):
+        reducs = t.apply.values
+    else:
+        reducs = [t.apply]
+    if not builtins.all(type(r) in binops_vec for r in reducs):
+        return None
+
+    result = _vectorize(t, seq, t.grouper, *[r._child for r in reducs])
+    if result is None or not builtins.all(isinstance(x, np.ndarray)
+                                          for x in result[1:]):
+        return None
+    keys, values = result[0], result[1:]
+
+    try:
+        codes, uniques = _factorize(keys, t.grouper.fields)
+    except (TypeError, ValueError):  # unhashable or missing keys
+        return None
+    counts = np.bincount(codes)
+    order = None
+
+    columns = []
+    for r, vals in zip(reducs, values):
+        ufunc = binops_vec[type(r)]
+        if isinstance(r, reductions.count):
+            columns.append(counts.tolist())
+        elif ufunc is np.add and vals.dtype.kind == 'f':
+            columns.append(np.bincount(codes, weights=vals).tolist())
+        else:
+            if ufunc is np.add and vals.dtype == bool:
+                vals = vals.astype('i8')
+            elif (ufunc is np.add and
+                    _magnitude(vals) * len(vals) > _int64_max):
+                return None  # an int64 sum might wrap around
+            if order is None:
+                order = np.argsort(codes, kind='mergesort')
+                starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            columns.append(ufunc.reduceat(vals[order], starts).tolist())
+
+    if isinstance(t.apply, Summary):
+        return dict(zip(uniques, zip(*columns)))
+    else:
+        return dict(zip(uniques, columns[0]))
+
+
 @dispatch(By, Sequence)
 def compute_up(t, seq, **kwargs):
-    if ((isinstance(t.apply, Reduction) and type(t.apply) in binops) or
+    d = _reduce_by_soa(t, seq)
+    if d is None and (
+        (isinstance(t.apply, Reduction) and type(t.apply) in binops) or
         (isinstance(t.apply, Summary) and builtins.all(type(val) in binops
                                                 for val in t.apply.values))):
         grouper, binop, combiner, initial = reduce_by_funcs(t)
         d = reduceby(grouper, binop, seq, initial)
-    else:
+    elif d is None:
         grouper = rrowfunc(t.grouper, t._child)
         groups = groupby(grouper, seq)
         d = dict((k, compute(t.apply, {t._child: v})) for k, v in groups.items())
@@ -389,39 +1216,92 @@ def compute_up(t, seq, **kwargs):
     return tuple(keyfunc(k) + valfunc(v) for k, v in d.items())
 
 
+def _tuple_getter(indices):
+    """ Function taking the items at ``indices`` of a row, as a tuple
+
+    Like ``operator.itemgetter`` but always returns a tuple.
+
+    >>> _tuple_getter([2, 0])(('a', 'b', 'c'))
+    ('c', 'a')
+    >>> _tuple_getter([1])(('a', 'b', 'c'))
+    ('b',)
+    """
+    if len(indices) > 1:
+        return itemgetter(*indices)
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda row: (row[index],)
+    return lambda row: ()
+
+
 def pair_assemble(t):
     """ Combine a pair of records into a single record
 
     This is mindful to shared columns as well as missing records
     """
-    from cytoolz import get  # not curried version
-    on_left = [t.lhs.fields.index(col) for col in listpack(t.on_left)]
-    on_right = [t.rhs.fields.index(col) for col in listpack(t.on_right)]
-
-    left_self_columns = [t.lhs.fields.index(c) for c in t.lhs.fields
-                                            if c not in listpack(t.on_left)]
-    right_self_columns = [t.rhs.fields.index(c) for c in t.rhs.fields
-                                            if c not in listpack(t.on_right)]
+    on_left = listpack(t.on_left)
+    on_right = listpack(t.on_right)
+
+    get_left_on = _tuple_getter([t.lhs.fields.index(c) for c in on_left])
+    get_right_on = _tuple_getter([t.rhs.fields.index(c) for c in on_right])
+    get_left = _tuple_getter([i for i, c in enumerate(t.lhs.fields)
+                                if c not in on_left])
+    get_right = _tuple_getter([i for i, c in enumerate(t.rhs.fields)
+                                 if c not in on_right])
+    left_missing = (None,) * (len(t.lhs.fields) - len(on_left))
+    right_missing = (None,) * (len(t.rhs.fields) - len(on_right))
+
     def assemble(pair):
         a, b = pair
-        if a is not None:
-            joined = get(on_left, a)
-        else:
-            joined = get(on_right, b)
+        if a is None:
+            return get_right_on(b) + left_missing + get_right(b)
+        if b is None:
+            return get_left_on(a) + get_left(a) + right_missing
+        return get_left_on(a) + get_left(a) + get_right(b)
 
-        if a is not None:
-            left_entries = get(left_self_columns, a)
-        else:
-            left_entries = (None,) * (len(t.lhs.fields) - len(on_left))
+    return assemble
 
-        if b is not None:
-            right_entries = get(right_self_columns, b)
-        else:
-            right_entries = (None,) * (len(t.rhs.fields) - len(on_right))
 
-        return joined + left_entries + right_entries
+def _join_pairs_soa(t, lhs, rhs):
+    """ Pairs of joined rows of ``lhs`` and ``rhs``, matched with pd.merge
 
-    return assemble
+    Only the key columns are converted to arrays.  pandas hash-joins them
+    along with row positions, which are then used to pair up the original
+    rows.  Pairs come in the same order as from ``toolz.join``: by right row,
+    with unmatched left rows at the end, grouped by key in order of first
+    appearance.  Returns ``None`` if the inputs can not be joined this way.
+    """
+    if not (isinstance(lhs, (tuple, list)) and isinstance(rhs, (tuple, list))
+            and len(lhs) + len(rhs) >= VECTORIZE_THRESHOLD):
+        return None
+    on_left, on_right = listpack(t.on_left), listpack(t.on_right)
+    left = _to_soa(lhs, t.lhs.dshape.measure, on_left)
+    right = _to_soa(rhs, t.rhs.dshape.measure, on_right)
+    if not isinstance(left, dict) or not isinstance(right, dict):
+        return None
+
+    try:
+        groups, _ = _factorize(left, on_left)
+    except (TypeError, ValueError):
+        return None
+
+    keys = ['key%d' % i for i in range(len(on_left))]
+    left = pd.DataFrame(dict(zip(keys, [left[c] for c in on_left])))
+    right = pd.DataFrame(dict(zip(keys, [right[c] for c in on_right])))
+    left['left'] = np.arange(len(lhs))
+    right['right'] = np.arange(len(rhs))
+    try:
+        merged = pd.merge(left, right, on=keys, how=t.how, sort=False)
+    except (TypeError, ValueError):
+        return None
+
+    li = merged['left'].fillna(-1).values.astype('i8')
+    ri = merged['right'].fillna(-1).values.astype('i8')
+    unmatched = ri < 0
+    order = np.lexsort((li, np.where(unmatched, groups[li], 0),
+                        np.where(unmatched, len(rhs), ri)))
+    return [(lhs[i] if i >= 0 else None, rhs[j] if j >= 0 else None)
+            for i, j in zip(li[order].tolist(), ri[order].tolist())]
 
 
 @dispatch(Join, (DataDescriptor, Sequence), (DataDescriptor, Sequence))
@@ -436,12 +1316,21 @@ def compute_up(t, lhs, rhs, **kwargs):
     while allowing the RIGHT sequence to stream.  As a result
 
     Always put your bigger collection on the RIGHT side of the Join.
+
+    Large lists and tuples are instead matched with a hash join in pandas,
+    see ``_join_pairs_soa``.
     """
+    pairs = _join_pairs_soa(t, lhs, rhs)
+    if pairs is not None:
+        return map(pair_assemble(t), pairs)
+
     if lhs == rhs:
         lhs, rhs = itertools.tee(lhs, 2)
 
-    on_left = [t.lhs.fields.index(col) for col in listpack(t.on_left)]
-    on_right = [t.rhs.fields.index(col) for col in listpack(t.on_right)]
+    on_left = itemgetter(*[t.lhs.fields.index(col)
+                           for col in listpack(t.on_left)])
+    on_right = itemgetter(*[t.rhs.fields.index(col)
+                            for col in listpack(t.on_right)])
 
     left_default = (None if t.how in ('right', 'outer')
                          else toolz.itertoolz.no_default)
@@ -458,8 +1347,43 @@ def compute_up(t, lhs, rhs, **kwargs):
     return map(assemble, pairs)
 
 
+def _sort_order(t, seq):
+    """ Positions of ``seq`` in sorted order, computed with NumPy
+
+    Sorting is stable in both directions, like ``sorted``.  Returns
+    ``None`` if the sort keys can not be vectorized.
+    """
+    if isinstance(t.key, (str, unicode)):
+        keys = [t._child[t.key]]
+    elif isinstance(t.key, (tuple, list)):
+        keys = [t._child[k] for k in t.key]
+    else:
+        keys = [t.key]
+    arrays = _vectorize(t, seq, *keys)
+    if arrays is None or not builtins.all(isinstance(a, np.ndarray)
+                                          for a in arrays):
+        return None
+    if not t.ascending:
+        # Stable descending order: sort the reversed keys, then flip back
+        arrays = [a[::-1] for a in arrays]
+    try:
+        if len(arrays) == 1:
+            order = np.argsort(arrays[0], kind='mergesort')
+        else:
+            order = np.lexsort(arrays[::-1])
+    except TypeError:  # unorderable values
+        return None
+    if not t.ascending:
+        order = len(seq) - 1 - order[::-1]
+    return order
+
+
 @dispatch(Sort, Sequence)
 def compute_up(t, seq, **kwargs):
+    order = _sort_order(t, seq)
+    if order is not None:
+        return list(map(seq.__getitem__, order.tolist()))
+
     if isinstance(t.key, (str, unicode, tuple, list)):
         key = rowfunc(t._child[t.key])
     else:
@@ -471,10 +1395,13 @@ def compute_up(t, seq, **kwargs):
 
 @dispatch(Head, Sequence)
 def compute_up(t, seq, **kwargs):
+    if isinstance(seq, (tuple, list)):
+        return tuple(seq[:t.n])
     if t.n < 100:
-        return tuple(take(t.n, seq))
+        # Read small heads eagerly, before the source may be closed
+        return tuple(itertools.islice(seq, t.n))
     else:
-        return take(t.n, seq)
+        return itertools.islice(seq, t.n)
 
 
 @dispatch((Label, ReLabel), Sequence)
@@ -514,18 +1441,125 @@ def like_regex_predicate(expr):
     regexes = dict((name, re.compile('^' + fnmatch.translate(pattern) + '$'))
                     for name, pattern in expr.patterns.items())
     regex_tup = [regexes.get(name, None) for name in expr.fields]
-    def predicate(tup):
+    def match_fields(tup):
         for item, regex in zip(tup, regex_tup):
             if regex and not regex.match(item):
                 return False
         return True
 
+    # Match all patterned fields at once, joined by NUL characters.  The
+    # number of NULs is fixed, so no wildcard can match across fields.
+    ids = [i for i, name in enumerate(expr.fields) if name in expr.patterns]
+    patterns = [expr.patterns[expr.fields[i]] for i in ids]
+    if len(ids) < 2 or builtins.any('\x00' in p for p in patterns):
+        return match_fields
+    combined = re.compile('\x00'.join('(?:%s)' % _glob_to_regex(p)
+                                      for p in patterns) + r'\Z', re.DOTALL)
+    get = _tuple_getter(ids)
+    def predicate(tup):
+        items = get(tup)
+        try:
+            joined = '\x00'.join(items)
+        except TypeError:
+            return match_fields(tup)
+        if joined.count('\x00') != len(ids) - 1:
+            return match_fields(tup)
+        return combined.match(joined) is not None
+
+    return predicate
+
+
+def _glob_to_regex(pattern):
+    """ Translate a glob pattern into an unanchored regex
+
+    Follows ``fnmatch.translate``, but leaves anchors and flags to the
+    caller, so that the output can be embedded in larger patterns and
+    compiled by Hyperscan.  ``.`` must match newlines.
+
+    >>> print(_glob_to_regex('*Smith?[!x]'))
+    .*Smith.[^x]
+    """
+    out, i, n = [], 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        i += 1
+        if c == '*':
+            out.append('.*')
+        elif c == '?':
+            out.append('.')
+        elif c == '[':
+            j = i
+            if j < n and pattern[j] == '!':
+                j += 1
+            if j < n and pattern[j] == ']':
+                j += 1
+            while j < n and pattern[j] != ']':
+                j += 1
+            if j >= n:
+                out.append('\\[')
+            else:
+                body = re.sub(r'([&~|\[])', r'\\\1',
+                              pattern[i:j].replace('\\', '\\\\'))
+                i = j + 1
+                if body[0] == '!':
+                    body = '^' + body[1:]
+                elif body[0] == '^':
+                    body = '\\' + body
+                out.append('[' + body + ']')
+        else:
+            out.append(re.escape(c))
+    return ''.join(out)
+
+
+def like_hyperscan_predicate(expr):
+    """ Like predicate scanning a single Hyperscan database
+
+    All patterns of ``expr`` are compiled together, with the position of
+    their field as pattern id.  Each patterned field of a row is scanned
+    once and must report the id of its own pattern.  Returns ``None`` if
+    ``hyperscan`` is not installed or can not compile the patterns, in
+    which case use ``like_regex_predicate``.
+
+    The database can not be pickled, so backends that ship predicates to
+    workers should keep using ``like_regex_predicate``.
+    """
+    if hyperscan is None:
+        return None
+    ids = [i for i, name in enumerate(expr.fields) if name in expr.patterns]
+    try:
+        db = hyperscan.Database()
+        patterns = ['^%s\\z' % _glob_to_regex(expr.patterns[expr.fields[i]])
+                    for i in ids]
+        db.compile(expressions=[p.encode('utf-8') for p in patterns],
+                   ids=ids,
+                   elements=len(ids),
+                   flags=[hyperscan.HS_FLAG_DOTALL | hyperscan.HS_FLAG_UTF8 |
+                          hyperscan.HS_FLAG_SINGLEMATCH] * len(ids))
+    except Exception:
+        return None
+
+    def on_match(id, start, end, flags, matched):
+        matched.add(id)
+
+    def predicate(tup):
+        matched = set()
+        for i in ids:
+            item = tup[i]
+            if isinstance(item, unicode):
+                item = item.encode('utf-8')
+            # Only matches within this field count, not earlier fields'
+            matched.clear()
+            db.scan(item, match_event_handler=on_match, context=matched)
+            if i not in matched:
+                return False
+        return True
+
     return predicate
 
 
 @dispatch(Like, Sequence)
 def compute_up(expr, seq, **kwargs):
-    predicate = like_regex_predicate(expr)
+    predicate = like_hyperscan_predicate(expr) or like_regex_predicate(expr)
     return filter(predicate, seq)
 
 
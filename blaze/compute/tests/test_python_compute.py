@@ -317,10 +317,13 @@ def test_fancy_sort():
 
 def test_head():
     assert list(compute(t.head(1), data)) == [data[0]]
+    assert compute(t.head(1), data) == (data[0],)
+    assert compute(t.head(2), tuple(data)) == tuple(data[:2])
 
     e = head(t, 101)
     p = list(range(1000))
     assert len(list(compute(e, p))) == 101
+    assert compute(e, p) == tuple(range(101))
 
 
 def test_graph_double_join():
@@ -435,6 +438,13 @@ def test_merge():
     assert list(compute(expr, data)) == [(row[0], row[1] * 2) for row in data]
 
 
+def test_merge_of_fields():
+    expr = merge(t[['id', 'name']], t.amount.label('total'))
+
+    assert list(compute(expr, data)) == [(row[2], row[0], row[1])
+                                         for row in data]
+
+
 def test_map_columnwise():
     colwise = t['amount'] * t['id']
 
@@ -551,6 +561,17 @@ def test_by_groupby_deep():
     assert result == set([('Alice', 1.5), ('Bob', 1.0)])
 
 
+def test_by_on_selection_keeps_selection_in_scope():
+    data = [(1, 2, 'Alice'),
+            (1, 3, 'Bob'),
+            (2, 4, 'Alice'),
+            (2, 4, '')]
+    t = Symbol('t', 'var * {x: int, y: int, name: string}')
+    t2 = t[t.name != '']
+    result = set(compute(by(t2.name, t2.x.mean()), data))
+    assert result == set([('Alice', 1.5), ('Bob', 1.0)])
+
+
 def test_by_then_sort_dict_items_sequence():
     expr = by(tbig.name, tbig.amount.sum()).sort('name')
     assert compute(expr, databig)
@@ -693,3 +714,292 @@ def test_slice():
     assert compute(t[0], data) == data[0]
     assert list(compute(t[:2], data)) == list(data[:2])
     assert list(compute(t.name[:2], data)) == [data[0][0], data[1][0]]
+
+
+def test_jit_elemwise_on_large_data():
+    pytest.importorskip('numba')
+    big = data * 1000
+    assert list(compute(t.amount + t.id, big)) == [x[1] + x[2] for x in big]
+
+    x = Symbol('x', 'var * int')
+    inc = lambda i: i + 1
+    assert list(compute(x.map(inc, 'int'), list(range(5000)))) == \
+            list(range(1, 5001))
+
+
+def test_jit_kernels_on_large_data_match_python():
+    pytest.importorskip('numba')
+    big = data * 1000
+    assert list(compute(t.amount * -1, big)) == [-x[1] for x in big]
+    assert list(compute(t.amount * -2, big)) == [-2 * x[1] for x in big]
+    assert raises(ZeroDivisionError,
+                  lambda: list(compute(t.amount // (t.id - t.id), big)))
+    assert raises(ZeroDivisionError,
+                  lambda: list(compute(t.amount % (t.id - t.id), big)))
+
+    x = Symbol('x', 'var * real')
+    vals = [float(i) for i in range(2000)]
+    for i in range(3):
+        assert list(compute(x.map(lambda v: v + i, 'real'), vals)) == \
+                [v + i for v in vals]
+
+
+def test_vectorized_large_sequences():
+    big = data * 1000
+    assert list(compute(t.amount, big)) == [x[1] for x in big]
+    assert list(compute(t[['name', 'id']], big)) == [(x[0], x[2]) for x in big]
+    assert list(compute(t.amount * 2 + t.id, big)) == \
+            [x[1] * 2 + x[2] for x in big]
+    assert list(compute(t[t.amount > 75], big)) == [x for x in big if x[1] > 75]
+    assert list(compute(t[t.name == 'Alice'].id, big)) == \
+            [x[2] for x in big if x[0] == 'Alice']
+    assert raises(ZeroDivisionError,
+                  lambda: list(compute(t.amount / (t.id - 1), big)))
+
+
+def test_fused_selection():
+    from blaze.compute.core import FusedSelectElem, fuse_selections
+    expr = (t[t.amount > 75].amount * 2).label('double')
+    assert isinstance(fuse_selections(expr), FusedSelectElem)
+
+    assert list(compute(expr, data)) == [x[1] * 2 for x in data if x[1] > 75]
+
+    big = data * 1000
+    assert list(compute(expr, big)) == [x[1] * 2 for x in big if x[1] > 75]
+    assert list(compute(t[t.amount > 75][['name', 'id']], big)) == \
+            [(x[0], x[2]) for x in big if x[1] > 75]
+
+
+def test_var_is_numerically_stable():
+    x = Symbol('x', 'var * float64')
+    vals = [1e9 + 4, 1e9 + 7, 1e9 + 13, 1e9 + 16]
+    assert abs(compute(x.var(), iter(vals)) - 22.5) < 1e-6
+    assert abs(compute(x.var(unbiased=True), iter(vals)) - 30.0) < 1e-6
+
+    big = vals * 1000
+    assert np.allclose(compute(x.var(), big), np.var(big))
+    assert np.allclose(compute(x.std(unbiased=True), big), np.std(big, ddof=1))
+    assert np.allclose(compute(x.mean(), big), np.mean(big))
+
+
+def test_vectorized_by():
+    big = data * 1000
+    assert set(compute(by(t.name, t.amount.sum()), big)) == \
+            set([('Alice', 150000), ('Bob', 200000)])
+    assert set(compute(by(t.name, (t.amount + 1).max()), big)) == \
+            set([('Alice', 101), ('Bob', 201)])
+    expr = by(t.name, summary(count=t.id.count(), total=t.amount.sum(),
+                              big=(t.amount > 75).any()))
+    assert set(compute(expr, big)) == set([('Alice', True, 2000, 150000),
+                                           ('Bob', True, 1000, 200000)])
+
+
+def test_vectorized_by_multi_column_grouper():
+    big = databig * 1000
+    result = compute(by(tbig[['name', 'sex']], tbig.amount.sum()), big)
+    assert set(result) == set([('Alice', 'F', 200000),
+                               ('Drew', 'F', 100000),
+                               ('Drew', 'M', 300000)])
+
+
+def test_like_hyperscan():
+    pytest.importorskip('hyperscan')
+    from blaze.compute.python import like_hyperscan_predicate
+    t = Symbol('t', 'var * {name: string, city: string}')
+    data = [('Alice Smith', 'New York'),
+            ('Bob Smith', 'Chicago'),
+            ('Alice Walker', 'LA')]
+
+    predicate = like_hyperscan_predicate(t.like(name='*Smith*', city='New*'))
+    assert list(filter(predicate, data)) == [data[0]]
+
+    # Each field must match its own pattern, not one matched by another field
+    predicate = like_hyperscan_predicate(t.like(name='Al*', city='Al*'))
+    assert not predicate(('Alice', 'zzz'))
+    assert predicate(('Alice', 'Albany'))
+
+
+def test_rowfuncs_are_cached():
+    from blaze.compute.python import rowfunc, rrowfunc
+    expr = t.amount * 2 + t.id
+    assert rowfunc(expr) is rowfunc(t.amount * 2 + t.id)
+    assert rrowfunc(expr.map(abs), t) is rrowfunc(expr.map(abs), t)
+    assert rrowfunc(t.amount + 1, t) is not rrowfunc(t.amount + 2, t)
+
+
+def test_rowfunc_cache_tells_similar_expressions_apart():
+    # hash(-1) == hash(-2) and 1 == 1.0, but these must not share rowfuncs
+    assert list(compute(t.amount * -1, data)) == [-100, -200, -50]
+    assert list(compute(t.amount * -2, data)) == [-200, -400, -100]
+    assert [type(x) for x in compute(t.amount + 1, data)] == [int] * 3
+    assert [type(x) for x in compute(t.amount + 1.0, data)] == [float] * 3
+
+
+def test_numexpr_broadcast_on_large_data():
+    pytest.importorskip('numexpr')
+    big = data * 1000
+    assert compute(t.amount * 2 + t.id, big) == \
+            [amt * 2 + id for _, amt, id in big]
+    assert compute(t.amount / t.id > 30, big) == \
+            [amt / id > 30 for _, amt, id in big]
+
+
+def test_nunique_on_large_integer_sequences():
+    big = [[str(i), i % 7, i] for i in range(5000)]
+    assert compute(t.amount.nunique(), big) == 7
+    assert compute(t.id.nunique(), big) == 5000
+    assert compute(t.name.nunique(), big) == 5000
+
+
+def test_join_large_sequences():
+    left = [(i, 'name%d' % i) for i in range(0, 3000, 2)]
+    right = [(i % 2000, i) for i in range(3000)]
+
+    L = Symbol('L', 'var * {id: int, name: string}')
+    R = Symbol('R', 'var * {id: int, amount: int}')
+
+    inner = list(compute(join(L, R, 'id'), {L: left, R: right}))
+    assert inner == [(i % 2000, 'name%d' % (i % 2000), i)
+                     for i in range(3000) if i % 2 == 0]
+
+    outer = list(compute(join(L, R, 'id', how='outer'), {L: left, R: right}))
+    assert outer[:2] == [(0, 'name0', 0), (1, None, 1)]
+    assert outer[-1] == (2998, 'name2998', None)
+    assert len(outer) == 3000 + len([i for i in range(2000, 3000, 2)])
+
+    # Unmatched left rows come grouped by key, as from the streaming join
+    left = [(i % 700, 'name%d' % i) for i in range(1400)]
+    right = [(i, i) for i in range(500)]
+    for how in ['left', 'outer']:
+        expr = join(L, R, 'id', how=how)
+        assert list(compute(expr, {L: left, R: right})) == \
+                list(compute(expr, {L: iter(left), R: iter(right)}))
+
+
+def test_var_nb_matches_numpy():
+    pytest.importorskip('numba')
+    from blaze.compute.python import _var_kernel
+    x = np.random.randn(10000) + 1e6
+    assert abs(_var_kernel()(x, 1) - x.var(ddof=1)) < 1e-6
+
+
+def test_sort_large_sequences():
+    big = [[name, amt % 3, i] for i, (name, amt, _) in enumerate(data * 1000)]
+    keys = [('amount', lambda row: row[1]),
+            ('name', lambda row: row[0]),
+            (['amount', 'name'], lambda row: (row[1], row[0])),
+            (t.id * -1, lambda row: -row[2])]
+    for key, rowkey in keys:
+        for ascending in [True, False]:
+            assert list(compute(t.sort(key, ascending=ascending), big)) == \
+                    sorted(big, key=rowkey, reverse=not ascending)
+
+
+def test_selection_mixed_predicate_on_large_data():
+    big = data * 1000
+    expr = t[(t.amount > 60) & (t.name == 'Alice') | (t.id > 2)]
+    assert compute(expr, big) == [row for row in big
+                                  if row[1] > 60 and row[0] == 'Alice'
+                                  or row[2] > 2]
+
+
+def test_reductions_on_large_sequences():
+    big = [[str(i), i % 5, i] for i in range(5000)]
+    assert compute(t.amount.count(), big) == 4000
+    assert compute(t.amount.mean(), big) == 2.0
+    assert abs(compute(t.amount.var(), big) - 2.0) < 1e-9
+
+
+def test_vectorize_iterators_in_chunks():
+    big = data * 3000
+    assert list(compute(t.amount * 2, iter(big))) == \
+            [row[1] * 2 for row in big]
+    assert list(compute(t[t.amount > 60], iter(big))) == \
+            [row for row in big if row[1] > 60]
+
+
+def test_vectorized_integer_arithmetic_does_not_overflow():
+    big = [['Alice', 3 * 10 ** 9, i] for i in range(1000)]
+    assert list(compute(t.amount * t.amount * t.amount, big)) == \
+            [27 * 10 ** 27] * 1000
+    assert list(compute(t.amount ** 3, big)) == [27 * 10 ** 27] * 1000
+    assert list(compute(-t.amount * t.amount + t.id, big)) == \
+            [-9 * 10 ** 18 + i for i in range(1000)]
+
+
+def test_vectorized_paths_keep_python_values():
+    big = [['Alice', 3 * 10 ** 9, i] for i in range(1000)]
+    cube = lambda x: x * x * x
+    assert list(compute(t.amount.map(cube, 'int'), big)) == \
+            [27 * 10 ** 27] * 1000
+
+    s = Symbol('s', 'var * {x: float64, y: int}')
+    ints = [(i, i) for i in range(1000)]
+    assert list(compute(s.x, ints)) == list(range(1000))
+    assert all(type(v) is int for v in compute(s.x, ints))
+    halves = [(0.0, 0.5)] * 1000
+    assert list(compute(s.y + 1, halves)) == [1.5] * 1000
+
+
+def test_vectorized_bool_negation_matches_python():
+    s = Symbol('s', 'var * {flag: bool, amount: int}')
+    small = [(i % 2 == 0, i) for i in range(10)]
+    big = small * 200
+    for expr in [~s.flag, -s.flag, ~(s.amount > 3), s[~s.flag].amount]:
+        assert list(compute(expr, big))[:10] == list(compute(expr, small))
+
+
+def test_selection_in_scope_is_not_fused():
+    big = data * 1000
+    t2 = t[t.amount > 75]
+    rows = [row for row in big if row[1] > 75]
+    assert list(compute(t2.id * 2, {t2: rows})) == [row[2] * 2 for row in rows]
+
+
+def test_vectorized_by_sum_does_not_overflow():
+    big = [['Alice', 3 * 10 ** 9, i] for i in range(1000)]
+    assert compute(by(t.name, (t.amount * t.amount).sum()), big) == \
+            (('Alice', 9 * 10 ** 21),)
+    big = [['Alice', 2 ** 62, i] for i in range(1000)]
+    assert compute(by(t.name, t.amount.sum()), big) == \
+            (('Alice', 2 ** 62 * 1000),)
+
+
+def test_vectorized_by_with_missing_keys():
+    nan = float('nan')
+    f = Symbol('f', 'var * {k: float64, v: int}')
+    result = compute(by(f.k, f.v.sum()), [(nan, 1), (1.0, 2)] * 500)
+    assert sorted(result, key=str) == [(1.0, 1000), (nan, 500)]
+
+    result = compute(by(t.name, t.amount.sum()),
+                     [(None, 1, 1), ('Alice', 2, 2)] * 500)
+    assert sorted(result, key=str) == [('Alice', 1000), (None, 500)]
+
+    result = compute(by(t[['name', 'id']], t.amount.sum()),
+                     [(None, 1, 1), ('Alice', 2, 1)] * 500)
+    assert sorted(result, key=str) == [('Alice', 1, 1000), (None, 1, 500)]
+
+
+def test_numexpr_refuses_integer_overflow():
+    pytest.importorskip('numexpr')
+    from blaze.compute.python import _numexpr_evaluate
+    expr = t.amount * t.amount * t.id
+    small = np.arange(1000)
+    assert (_numexpr_evaluate(expr, {'amount': small, 'id': small}) ==
+            small ** 3).all()
+    large = np.array([3 * 10 ** 9] * 1000)
+    assert _numexpr_evaluate(expr, {'amount': large, 'id': large}) is None
+
+
+def test_numexpr_sources_tell_similar_expressions_apart():
+    pytest.importorskip('numexpr')
+    from blaze.compute.python import _numexpr_evaluate
+    x = np.arange(1000)
+    assert (_numexpr_evaluate(t.amount * -1, {'amount': x}) == -x).all()
+    assert (_numexpr_evaluate(t.amount * -2, {'amount': x}) == -2 * x).all()
+
+
+def test_count_and_nunique_do_not_truncate():
+    x = Symbol('x', 'var * int')
+    assert compute(x.count(), [0.5] * 1000) == 1000
+    assert compute(x.nunique(), [0.5, 0.25] * 500) == 2
@@ -9,7 +9,7 @@ from datashape.predicates import isscalar
 from datashape import coretypes as ct
 
 from .core import parenthesize, eval_str
-from .expressions import Expr, shape
+from .expressions import Expr, shape, _parse_dshape
 from ..dispatch import dispatch
 from ..compatibility import _strtypes
 
@@ -79,7 +79,7 @@ class UnaryOp(Expr):
 
 class Arithmetic(BinOp):
     """ Super class for arithmetic operators like add or mul """
-    _dtype = 'real'
+    _dtype = ct.real
 
     @property
     def dshape(self):
@@ -188,7 +188,7 @@ def scalar_coerce(dtype, val):
 
 @dispatch(_strtypes, object)
 def scalar_coerce(ds, val):
-    return scalar_coerce(dshape(ds), val)
+    return scalar_coerce(_parse_dshape(ds), val)
 
 
 def _neg(self):
@@ -238,7 +238,7 @@ def _rmod(self, other):
 
 
 class Relational(Arithmetic):
-    _dtype = 'bool'
+    _dtype = ct.bool_
 
 
 class Eq(Relational):
@@ -274,13 +274,13 @@ class Lt(Relational):
 class And(Arithmetic):
     symbol = '&'
     op = operator.and_
-    _dtype = 'bool'
+    _dtype = ct.bool_
 
 
 class Or(Arithmetic):
     symbol = '|'
     op = operator.or_
-    _dtype = 'bool'
+    _dtype = ct.bool_
 
 
 class Not(UnaryOp):
@@ -289,7 +289,7 @@ class Not(UnaryOp):
 
     @property
     def dshape(self):
-        return DataShape(*(shape(self._child) + ('bool',)))
+        return DataShape(*(shape(self._child) + (ct.bool_,)))
 
 
 def _eq(self, other):
@@ -3,7 +3,7 @@ from __future__ import absolute_import, division, print_function
 from datashape.predicates import iscollection, isscalar, isnumeric
 from toolz import partial, unique, first
 import datashape
-from datashape import dshape, DataShape, Record, Var, Option, Unit
+from datashape import dshape, DataShape, Record, Var, Option
 
 from .expressions import ElemWise, Label, Expr, Symbol, Field
 from .core import eval_str
@@ -218,12 +218,18 @@ def isnan(expr):
 
 from .expressions import dshape_method_list
 
+# Every unit whose name contains ``float``, including the complex types
+_floating = frozenset([datashape.float16, datashape.float32,
+                       datashape.float64, datashape.complex64,
+                       datashape.complex128])
+
+
 def isreal(ds):
     if isinstance(ds, DataShape) and len(ds) == 1:
         ds = ds[0]
     if isinstance(ds, Option):
         ds = ds.ty
-    return isinstance(ds, Unit) and 'float' in str(ds)
+    return ds in _floating
 
 dshape_method_list.extend([
     (lambda ds: iscollection(ds) and isscalar(ds.measure),
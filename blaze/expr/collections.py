@@ -1,11 +1,12 @@
 from __future__ import absolute_import, division, print_function
 
-from toolz import isdistinct, frequencies, concat, unique, get
+from cytoolz import concat, unique
 import datashape
 from datashape import Option, Record, Unit, dshape, var
 from datashape.predicates import isscalar, iscollection
 
-from .core import common_subexpression
+from ..compatibility import builtins
+from .core import common_subexpression, cached, cached_property, _subterm_set
 from .expressions import Expr, ElemWise, Symbol, label
 
 __all__ = ['Sort', 'Distinct', 'Head', 'Merge', 'Union', 'distinct', 'merge',
@@ -119,7 +120,7 @@ class Head(Expr):
     """
     __slots__ = '_child', 'n'
 
-    @property
+    @cached_property
     def dshape(self):
         return self.n * self._child.dshape.subshape[0]
 
@@ -150,9 +151,11 @@ def merge(*exprs, **kwargs):
 
     result = Merge(child, exprs)
 
-    if not isdistinct(result.fields):
-        raise ValueError("Repeated columns found: " + ', '.join(k for k, v in
-            frequencies(result.fields).items() if v > 1))
+    seen = set()
+    repeated = [k for k in result.fields if k in seen or seen.add(k)]
+    if repeated:
+        raise ValueError("Repeated columns found: " +
+                         ', '.join(unique(repeated)))
 
     return result
 
@@ -162,21 +165,35 @@ def schema_concat(exprs):
 
     In the case of Units, the name is taken from expr.name
     """
-    names, values = [], []
+    fields = []
     for c in exprs:
-        schema = c.schema[0]
-        if isinstance(schema, Option):
-            schema = schema.ty
+        measure = c.schema[0]
+        schema = measure.ty if isinstance(measure, Option) else measure
         if isinstance(schema, Record):
-            names.extend(schema.names)
-            values.extend(schema.types)
+            fields.extend(schema.fields)
         elif isinstance(schema, Unit):
-            names.append(c._name)
-            values.append(schema)
+            fields.append((c._name, schema))
         else:
             raise TypeError("All schemas must have Record or Unit shape."
-                            "\nGot %s" % c.schema[0])
-    return dshape(Record(list(zip(names, values))))
+                            "\nGot %s" % measure)
+    return dshape(Record(fields))
+
+
+def _children_leaves(expr):
+    return tuple(unique(concat(i._leaves() for i in expr.children)))
+
+
+def _children_subterms(expr):
+    result = [expr]
+    for child in expr.children:
+        result.extend(child._subterms())
+    return tuple(result)
+
+
+def _children_contain(expr, other):
+    # Like ``_subterms``, search the children rather than only ``_inputs``
+    return (other in _subterm_set(expr) or
+            builtins.any(other in child for child in expr.children))
 
 
 class Merge(ElemWise):
@@ -192,19 +209,23 @@ class Merge(ElemWise):
     """
     __slots__ = '_child', 'children'
 
-    @property
+    @cached_property
     def schema(self):
         return schema_concat(self.children)
 
     @property
     def fields(self):
-        return list(concat(child.fields for child in self.children))
+        return list(self._field_names)
+
+    @cached_property
+    def _field_names(self):
+        return tuple(concat(child.fields for child in self.children))
 
     def _subterms(self):
-        yield self
-        for i in self.children:
-            for node in i._subterms():
-                yield node
+        return cached(self, '_subterms_cache', _children_subterms)
+
+    def __contains__(self, other):
+        return _children_contain(self, other)
 
     def _get_field(self, key):
         for child in self.children:
@@ -220,7 +241,7 @@ class Merge(ElemWise):
         return merge(*[self[c] for c in key])
 
     def _leaves(self):
-        return list(unique(concat(i._leaves() for i in self.children)))
+        return list(cached(self, '_leaves_cache', _children_leaves))
 
 
 class Union(Expr):
@@ -247,17 +268,17 @@ class Union(Expr):
     __inputs__ = 'children',
 
     def _subterms(self):
-        yield self
-        for i in self.children:
-            for node in i._subterms():
-                yield node
+        return cached(self, '_subterms_cache', _children_subterms)
 
-    @property
+    def __contains__(self, other):
+        return _children_contain(self, other)
+
+    @cached_property
     def dshape(self):
         return datashape.var * self.children[0].dshape.subshape[0]
 
     def _leaves(self):
-        return list(unique(concat(i._leaves() for i in self.children)))
+        return list(cached(self, '_leaves_cache', _children_leaves))
 
 
 def union(*children):
@@ -282,6 +303,17 @@ def unpack(l):
         return l
 
 
+def _columns(on):
+    """ Joining column names as a tuple
+
+    >>> _columns('id')
+    ('id',)
+    >>> _columns(('id', 'name'))
+    ('id', 'name')
+    """
+    return tuple(on) if isinstance(on, (tuple, list)) else (on,)
+
+
 class Join(Expr):
     """ Join two tables on common columns
 
@@ -328,7 +360,7 @@ class Join(Expr):
         else:
             return self._on_right
 
-    @property
+    @cached_property
     def schema(self):
         """
 
@@ -345,15 +377,14 @@ class Join(Expr):
         dshape("{ name : string, amount : int32, id : ?int32 }")
         """
         option = lambda dt: dt if isinstance(dt, Option) else Option(dt)
+        on_left, on_right = self._on_left, self._on_right
 
-        joined = [[name, dt] for name, dt in self.lhs.schema[0].parameters[0]
-                        if name in self.on_left]
-
-        left = [[name, dt] for name, dt in self.lhs.schema[0].parameters[0]
-                           if name not in self.on_left]
+        joined, left = [], []
+        for name, dt in self.lhs.schema[0].parameters[0]:
+            (joined if name in on_left else left).append([name, dt])
 
         right = [[name, dt] for name, dt in self.rhs.schema[0].parameters[0]
-                            if name not in self.on_right]
+                            if name not in on_right]
 
         if self.how in ('right', 'outer'):
             left = [[name, option(dt)] for name, dt in left]
@@ -363,7 +394,7 @@ class Join(Expr):
         return dshape(Record(joined + left + right))
 
 
-    @property
+    @cached_property
     def dshape(self):
         # TODO: think if this can be generalized
         return var * self.schema
@@ -371,20 +402,20 @@ class Join(Expr):
 
 def join(lhs, rhs, on_left=None, on_right=None, how='inner'):
     if not on_left and not on_right:
-        on_left = on_right = unpack(list(sorted(
-            set(lhs.fields) & set(rhs.fields),
-            key=lhs.fields.index)))
+        rhs_fields = set(rhs.fields)
+        on_left = on_right = unpack([name for name in lhs.fields
+                                          if name in rhs_fields])
     if not on_right:
         on_right = on_left
-    if isinstance(on_left, tuple):
-        on_left = list(on_left)
-    if isinstance(on_right, tuple):
-        on_right = list(on_right)
-    if get(on_left, lhs.schema[0]) != get(on_right, rhs.schema[0]):
+    if isinstance(on_left, list):
+        on_left = tuple(on_left)
+    if isinstance(on_right, list):
+        on_right = tuple(on_right)
+    left_types = dict(lhs.schema[0].fields)
+    right_types = dict(rhs.schema[0].fields)
+    if ([left_types[c] for c in _columns(on_left)] !=
+        [right_types[c] for c in _columns(on_right)]):
         raise TypeError("Schema's of joining columns do not match")
-    _on_left = tuple(on_left) if isinstance(on_left, list) else on_left
-    _on_right = (tuple(on_right) if isinstance(on_right, list)
-                        else on_right)
 
     how = how.lower()
     if how not in ('inner', 'outer', 'left', 'right'):
@@ -392,7 +423,7 @@ def join(lhs, rhs, on_left=None, on_right=None, how='inner'):
                          "\n\tinner, outer, left, right."
                          "\nGot: %s" % how)
 
-    return Join(lhs, rhs, _on_left, _on_right, how)
+    return Join(lhs, rhs, on_left, on_right, how)
 
 
 join.__doc__ = Join.__doc__
@@ -4,7 +4,8 @@ import numbers
 import toolz
 import inspect
 
-from toolz import unique, concat, compose, partial
+from toolz import compose, partial
+from cytoolz import unique, concat
 import toolz
 from pprint import pprint
 
@@ -14,6 +15,50 @@ from ..dispatch import dispatch
 __all__ = ['Node', 'path', 'common_subexpression', 'eval_str']
 
 
+def cached(node, key, func):
+    """ ``func(node)``, computed once and then kept on ``node``
+
+    Nodes are immutable, so values derived from them alone can be stored in
+    the instance dict, next to the ``__slots__`` that define them.
+
+    >>> from blaze.expr import Symbol
+    >>> t = Symbol('t', 'var * {x: int}')
+    >>> cached(t, '_example', lambda t: [t])
+    [t]
+    >>> cached(t, '_example', lambda t: 'not computed again')
+    [t]
+    """
+    d = node.__dict__
+    try:
+        return d[key]
+    except KeyError:
+        result = d[key] = func(node)
+        return result
+
+
+class cached_property(object):
+    """ Property computed once per node, see ``cached``
+
+    For immutable values derived from a node, like its datashape.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.key = '_cached_' + func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, node, cls=None):
+        if node is None:
+            return self
+        return cached(node, self.key, self.func)
+
+
+def _node_leaves(node):
+    if not node._inputs:
+        return (node,)
+    return tuple(unique(concat(i._leaves() for i in node._inputs
+                               if isinstance(i, Node))))
+
+
 class Node(object):
     """ Node in a tree
 
@@ -70,11 +115,7 @@ class Node(object):
         [t, v]
         """
 
-        if not self._inputs:
-            return [self]
-        else:
-            return list(unique(concat(i._leaves() for i in self._inputs if
-                                      isinstance(i, Node))))
+        return list(cached(self, '_leaves_cache', _node_leaves))
 
     def isidentical(self, other):
         return type(self) == type(other) and self._args == other._args
@@ -118,7 +159,7 @@ class Node(object):
         return subterms(self)
 
     def __contains__(self, other):
-        return other in set(self._subterms())
+        return other in _subterm_set(self)
 
     def __getstate__(self):
         return self._args
@@ -136,83 +177,37 @@ class Node(object):
             pass
         return False
 
-    def __ne__(self, other):
-        return self._ne(other)
-
-    def __lt__(self, other):
-        return self._lt(other)
-
-    def __le__(self, other):
-        return self._le(other)
-
-    def __gt__(self, other):
-        return self._gt(other)
-
-    def __ge__(self, other):
-        return self._ge(other)
-
-    def __add__(self, other):
-        return self._add(other)
+    def _operator(self, name, *args):
+        """ Apply the operator method ``name``, e.g. ``'_add'`` for ``+`` """
+        return getattr(self, name)(*args)
 
-    def __radd__(self, other):
-        return self._radd(other)
 
-    def __mul__(self, other):
-        return self._mul(other)
+def _operator_method(dunder, name):
+    def method(self, *args):
+        return self._operator(name, *args)
+    method.__name__ = dunder
+    return method
 
-    def __rmul__(self, other):
-        return self._rmul(other)
 
-    def __div__(self, other):
-        return self._div(other)
+# Python operators and the methods implementing them, provided for each
+# datashape through ``dshape_method_list``/``schema_method_list``
+_operators = [('__ne__', '_ne'), ('__lt__', '_lt'), ('__le__', '_le'),
+              ('__gt__', '_gt'), ('__ge__', '_ge'),
+              ('__add__', '_add'), ('__radd__', '_radd'),
+              ('__mul__', '_mul'), ('__rmul__', '_rmul'),
+              ('__div__', '_div'), ('__rdiv__', '_rdiv'),
+              ('__truediv__', '_div'), ('__rtruediv__', '_rdiv'),
+              ('__floordiv__', '_floordiv'), ('__rfloordiv__', '_rfloordiv'),
+              ('__sub__', '_sub'), ('__rsub__', '_rsub'),
+              ('__pow__', '_pow'), ('__rpow__', '_rpow'),
+              ('__mod__', '_mod'), ('__rmod__', '_rmod'),
+              ('__or__', '_or'), ('__ror__', '_ror'),
+              ('__and__', '_and'), ('__rand__', '_rand'),
+              ('__neg__', '_neg'), ('__invert__', '_invert')]
 
-    def __rdiv__(self, other):
-        return self._rdiv(other)
-
-    __truediv__ = __div__
-    __rtruediv__ = __rdiv__
-
-    def __floordiv__(self, other):
-        return self._floordiv(other)
-
-    def __rfloordiv__(self, other):
-        return self._rfloordiv(other)
-
-    def __sub__(self, other):
-        return self._sub(other)
-
-    def __rsub__(self, other):
-        return self._rsub(other)
-
-    def __pow__(self, other):
-        return self._pow(other)
-
-    def __rpow__(self, other):
-        return self._rpow(other)
-
-    def __mod__(self, other):
-        return self._mod(other)
-
-    def __rmod__(self, other):
-        return self._rmod(other)
-
-    def __or__(self, other):
-        return self._or(other)
-
-    def __ror__(self, other):
-        return self._ror(other)
-
-    def __and__(self, other):
-        return self._and(other)
-
-    def __rand__(self, other):
-        return self._rand(other)
-
-    def __neg__(self):
-        return self._neg()
-
-    def __invert__(self):
-        return self._invert()
+for _dunder, _name in _operators:
+    setattr(Node, _dunder, _operator_method(_dunder, _name))
+del _dunder, _name
 
 
 def get_callable_name(o):
@@ -254,7 +249,12 @@ def _str(s):
 
 @dispatch(Node)
 def subterms(expr):
-    return concat([[expr], concat(map(subterms, expr._inputs))])
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, Node):
+            stack.extend(reversed(node._inputs))
 
 
 @dispatch(object)
@@ -340,11 +340,23 @@ def common_subexpression(*exprs):
     >>> common_subexpression(t.x, t.y)
     t
     """
-    sets = [set(subterms(t)) for t in exprs]
-    return builtins.max(set.intersection(*sets),
+    sets = [_subterm_set(t) for t in exprs]
+    return builtins.max(frozenset.intersection(*sets),
                         key=compose(len, str))
 
 
+def _subterm_set(expr):
+    """ ``set(subterms(expr))``, cached on each node
+
+    Shared subtrees are walked once rather than once per path to them.
+    """
+    if not isinstance(expr, Node):
+        return frozenset([expr])
+    return cached(expr, '_subterm_set',
+                  lambda e: frozenset([e]).union(*map(_subterm_set,
+                                                      e._inputs)))
+
+
 def eval_str(expr):
     """ String suitable for evaluation
 
@@ -11,6 +11,7 @@ from datashape.predicates import isscalar, iscollection, isboolean, isrecord
 
 from ..compatibility import _strtypes, builtins
 from .core import *
+from .core import cached_property
 from .method_dispatch import select_functions
 from ..dispatch import dispatch
 
@@ -31,6 +32,11 @@ def isvalid_identifier(s):
     """
     return not not re.match('^\w+$', s)
 
+# Parsed datashapes by their string.  Expressions are built from the same
+# few datashape strings over and over, and parsing dominates building them.
+_parse_dshape = memoize(dshape)
+
+
 class Expr(Node):
     """
     Symbolic expression of a computation
@@ -48,13 +54,13 @@ class Expr(Node):
         return Field(self, fieldname)
 
     def __getitem__(self, key):
-        if isinstance(key, _strtypes) and key in self.fields:
+        if isinstance(key, _strtypes) and key in self._field_names:
             return self._get_field(key)
         elif isinstance(key, Expr) and iscollection(key.dshape):
             return selection(self, key)
         elif (isinstance(key, list)
                 and builtins.all(isinstance(k, _strtypes) for k in key)):
-            if set(key).issubset(self.fields):
+            if set(key).issubset(self._field_names):
                 return self._project(key)
             else:
                 raise ValueError('Names %s not consistent with known names %s'
@@ -72,7 +78,7 @@ class Expr(Node):
     def _project(self, key):
         return projection(self, key)
 
-    @property
+    @cached_property
     def schema(self):
         return datashape.dshape(self.dshape.measure)
 
@@ -83,6 +89,21 @@ class Expr(Node):
         if hasattr(self, '_name'):
             return [self._name]
 
+    @cached_property
+    def _field_names(self):
+        """ ``fields`` as a tuple, for repeated lookups """
+        return tuple(self.fields or ())
+
+    @cached_property
+    def _field_types(self):
+        """ Mapping of field name to type of a record expression """
+        return dict(self.dshape.measure.fields)
+
+    @cached_property
+    def _methods(self):
+        """ ``methods`` of our datashape, without rehashing it per lookup """
+        return methods(self.dshape)
+
     def _len(self):
         try:
             return int(self.dshape[0])
@@ -98,9 +119,7 @@ class Expr(Node):
         if isrecord(self.dshape.measure) and self.fields:
             result.extend(list(self.fields))
 
-        d = toolz.merge(schema_methods(self.dshape.measure),
-                        dshape_methods(self.dshape))
-        result.extend(list(d))
+        result.extend(list(self._methods))
 
         return sorted(set(filter(isvalid_identifier, result)))
 
@@ -108,13 +127,12 @@ class Expr(Node):
         try:
             return object.__getattribute__(self, key)
         except AttributeError:
-            if self.fields and key in self.fields:
+            if key in self._field_names:
                 if isscalar(self.dshape.measure): # t.foo.foo is t.foo
                     return self
                 else:
                     return self[key]
-            d = toolz.merge(schema_methods(self.dshape.measure),
-                            dshape_methods(self.dshape))
+            d = self._methods
             if key in d:
                 func = d[key]
                 if func in method_properties:
@@ -124,6 +142,14 @@ class Expr(Node):
             else:
                 raise
 
+    def _operator(self, name, *args):
+        # Call the method straight from the table rather than through
+        # ``__getattr__``, which wraps it up for interactive use
+        func = self._methods.get(name)
+        if func is None:
+            return getattr(self, name)(*args)
+        return func(self, *args)
+
     @property
     def _name(self):
         pass
@@ -144,7 +170,7 @@ class Symbol(Expr):
     def __init__(self, name, dshape):
         self._name = name
         if isinstance(dshape, _strtypes):
-            dshape = datashape.dshape(dshape)
+            dshape = _parse_dshape(dshape)
         if isinstance(dshape, Mono) and not isinstance(dshape, DataShape):
             dshape = DataShape(dshape)
         self.dshape = dshape
@@ -162,7 +188,7 @@ class ElemWise(Expr):
 
     The shape of this expression matches the shape of the child.
     """
-    @property
+    @cached_property
     def dshape(self):
         return datashape.DataShape(*(self._child.dshape.shape
                                   + tuple(self.schema)))
@@ -194,10 +220,10 @@ class Field(ElemWise):
     def _expr(self):
         return Symbol(self._name, datashape.DataShape(self.dshape.measure))
 
-    @property
+    @cached_property
     def dshape(self):
         shape = self._child.dshape.shape
-        schema = self._child.dshape.measure.dict[self._name]
+        schema = self._child._field_types[self._name]
 
         shape = shape + schema.shape
         schema = (schema.measure,)
@@ -229,10 +255,10 @@ class Projection(ElemWise):
     def fields(self):
         return list(self._fields)
 
-    @property
+    @cached_property
     def schema(self):
-        d = self._child.schema[0].dict
-        return DataShape(Record([(name, d[name]) for name in self.fields]))
+        d = self._child._field_types
+        return DataShape(Record([(name, d[name]) for name in self._fields]))
 
     def __str__(self):
         return '%s[[%s]]' % (self._child,
@@ -390,13 +416,11 @@ class ReLabel(ElemWise):
     """
     __slots__ = '_child', 'labels'
 
-    @property
+    @cached_property
     def schema(self):
         subs = dict(self.labels)
-        d = self._child.dshape.measure.dict
-
         return DataShape(Record([[subs.get(name, name), dtype]
-            for name, dtype in self._child.dshape.measure.parameters[0]]))
+            for name, dtype in self._child.dshape.measure.fields]))
 
     def __str__(self):
         return '%s.relabel(%s)' % (self._child, ', '.join('%s="%s"' % l for l
@@ -444,7 +468,7 @@ class Map(ElemWise):
     @property
     def schema(self):
         if self._schema:
-            return dshape(self._schema)
+            return _parse_dshape(self._schema)
         else:
             raise NotImplementedError("Schema of mapped column not known.\n"
                     "Please specify datashape keyword in .map method.\n"
@@ -514,7 +538,7 @@ class Apply(Expr):
     @property
     def dshape(self):
         if self._dshape:
-            return dshape(self._dshape)
+            return _parse_dshape(self._dshape)
         else:
             raise NotImplementedError("Datashape of arbitrary Apply not defined")
 
@@ -527,6 +551,12 @@ dshape_methods = memoize(partial(select_functions, dshape_method_list))
 schema_methods = memoize(partial(select_functions, schema_method_list))
 
 
+@memoize
+def methods(ds):
+    """ All methods of expressions with datashape ``ds`` """
+    return toolz.merge(schema_methods(ds.measure), dshape_methods(ds))
+
+
 def shape(expr):
     """ Shape of expression
 
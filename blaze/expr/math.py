@@ -13,11 +13,16 @@ __all__ = ['sqrt', 'sin', 'sinh', 'cos', 'cosh', 'tan', 'tanh', 'exp', 'expm1',
         'atanh', 'radians', 'degrees', 'ceil', 'floor', 'trunc', 'isnan',
         'RealMath', 'IntegerMath', 'BooleanMath']
 
+# Parse these once rather than on every ``.dshape`` access
+real_dshape = dshape('real')
+int_dshape = dshape('int')
+bool_dshape = dshape('bool')
+
 class RealMath(UnaryOp):
     """ Mathematical unary operator with real valued dshape like sin, or exp """
     @property
     def dshape(self):
-        return dshape('real')
+        return real_dshape
 
 
 class sqrt(RealMath): pass
@@ -50,7 +55,7 @@ class IntegerMath(UnaryOp):
     """ Mathematical unary operator with int valued dshape like ceil, floor """
     @property
     def dshape(self):
-        return dshape('int')
+        return int_dshape
 
 
 class ceil(IntegerMath): pass
@@ -62,7 +67,7 @@ class BooleanMath(UnaryOp):
     """ Mathematical unary operator with bool valued dshape like isnan """
     @property
     def dshape(self):
-        return dshape('bool')
+        return bool_dshape
 
 
 class isnan(BooleanMath): pass
@@ -1,6 +1,7 @@
 from __future__ import absolute_import, division, print_function
 
 import ast
+import numbers
 from itertools import repeat
 
 from toolz import merge
@@ -20,6 +21,27 @@ def generate_methods(node_names, funcs, builder):
     return wrapped
 
 
+def fold(op, *args):
+    """ Apply ``op`` to ``args``, evaluating it now if all are numbers
+
+    >>> fold(arithmetic.Mult, 2, 3)
+    6
+    >>> fold(arithmetic.Mult, 2, Symbol('x', 'int'))
+    2 * x
+
+    ``Pow`` is never folded so that parsing stays cheap for any input, nor
+    are booleans, whose ``~`` differs between Python and NumPy.
+    """
+    if (op is not arithmetic.Pow and hasattr(op, 'op') and
+            all(isinstance(arg, numbers.Number) and not isinstance(arg, bool)
+                for arg in args)):
+        try:
+            return op.op(*args)
+        except ArithmeticError:
+            pass
+    return op(*args)
+
+
 arithmetic_ops = ['Eq', 'Ne', 'Lt', 'Gt', 'Le', 'Ge', 'BitAnd', 'BitOr',
         'Invert', 'USub', 'Add', 'Mult', 'Div', 'FloorDiv', 'Pow', 'Mod',
         'Sub']
@@ -35,8 +57,8 @@ class BlazeParser(ast.NodeVisitor):
     def visit_Compare(self, node):
         assert len(node.ops) == 1, 'chained comparisons not supported'
         assert len(node.comparators) == 1, 'chained comparisons not supported'
-        return self.visit(node.ops[0])(self.visit(node.left),
-                                       self.visit(node.comparators[0]))
+        return fold(self.visit(node.ops[0]), self.visit(node.left),
+                    self.visit(node.comparators[0]))
 
     def visit_Num(self, node):
         return node.n
@@ -54,15 +76,15 @@ class BlazeParser(ast.NodeVisitor):
             return Symbol(name, self.dtypes[name])
 
     def visit_BinOp(self, node):
-        return self.visit(node.op)(self.visit(node.left),
-                                   self.visit(node.right))
+        return fold(self.visit(node.op), self.visit(node.left),
+                    self.visit(node.right))
 
     def visit_UnaryOp(self, node):
         op = node.op
         operand = node.operand
         if isinstance(operand, ast.Num):
             return -1 * isinstance(op, ast.USub) * operand.n
-        return self.visit(op)(self.visit(operand))
+        return fold(self.visit(op), self.visit(operand))
 
     def visit_Call(self, node):
         assert len(node.args) <= 1, 'only single argument functions allowed'
@@ -1,13 +1,12 @@
 from __future__ import absolute_import, division, print_function
 
-import toolz
 from toolz import first
 import datashape
 from datashape import Record, dshape, DataShape
 from datashape import coretypes as ct
 from datashape.predicates import isscalar, iscollection
 
-from .core import common_subexpression
+from .core import common_subexpression, cached_property
 from .expressions import Expr, Symbol
 
 
@@ -47,7 +46,7 @@ class Reduction(Expr):
         self.axis = axis
         self.keepdims = keepdims
 
-    @property
+    @cached_property
     def dshape(self):
         axis = self.axis
         if self.keepdims:
@@ -71,6 +70,15 @@ class Reduction(Expr):
             return type(self).__name__
 
 
+def _child_dtype(expr):
+    """ Type of the one column reduced by ``expr``, for ``sum``, ``min``, ... """
+    schema = expr._child.schema[0]
+    if isinstance(schema, Record) and len(schema.fields) == 1:
+        return schema.fields[0][1]
+    else:
+        return schema
+
+
 class any(Reduction):
     _dtype = ct.bool_
 
@@ -78,31 +86,13 @@ class all(Reduction):
     _dtype = ct.bool_
 
 class sum(Reduction):
-    @property
-    def _dtype(self):
-        schema = self._child.schema[0]
-        if isinstance(schema, Record) and len(schema.types) == 1:
-            return first(schema.types)
-        else:
-            return schema
+    _dtype = cached_property(_child_dtype)
 
 class max(Reduction):
-    @property
-    def _dtype(self):
-        schema = self._child.schema[0]
-        if isinstance(schema, Record) and len(schema.types) == 1:
-            return first(schema.types)
-        else:
-            return schema
+    _dtype = cached_property(_child_dtype)
 
 class min(Reduction):
-    @property
-    def _dtype(self):
-        schema = self._child.schema[0]
-        if isinstance(schema, Record) and len(schema.types) == 1:
-            return first(schema.types)
-        else:
-            return schema
+    _dtype = cached_property(_child_dtype)
 
 class mean(Reduction):
     _dtype = ct.real
@@ -207,8 +197,7 @@ class Summary(Expr):
 
 def summary(keepdims=False, **kwargs):
     items = sorted(kwargs.items(), key=first)
-    names = tuple(map(first, items))
-    values = tuple(map(toolz.second, items))
+    names, values = zip(*items) if items else ((), ())
     child = common_subexpression(*values)
 
     if len(kwargs) == 1 and not iscollection(child.dshape):
@@ -1,6 +1,6 @@
 from __future__ import absolute_import, division, print_function
 
-from .core import common_subexpression
+from .core import common_subexpression, cached_property
 from .expressions import Expr, Symbol
 from .reductions import Reduction, Summary, summary
 from ..dispatch import dispatch
@@ -9,13 +9,12 @@ from datashape import dshape, Record, Option, Unit, var
 __all__ = ['by', 'By', 'count_values']
 
 def _names_and_types(expr):
-    schema = expr.dshape.measure
-    if isinstance(schema, Option):
-        schema = schema.ty
+    measure = expr.dshape.measure
+    schema = measure.ty if isinstance(measure, Option) else measure
     if isinstance(schema, Record):
         return schema.names, schema.types
     if isinstance(schema, Unit):
-        return [expr._name], [expr.dshape.measure]
+        return [expr._name], [measure]
     raise ValueError("Unable to determine name and type of %s" % expr)
 
 
@@ -39,11 +38,11 @@ class By(Expr):
 
     __slots__ = 'grouper', 'apply'
 
-    @property
+    @cached_property
     def _child(self):
         return common_subexpression(self.grouper, self.apply)
 
-    @property
+    @cached_property
     def schema(self):
         grouper_names, grouper_types = _names_and_types(self.grouper)
         apply_names, apply_types = _names_and_types(self.apply)
@@ -53,7 +52,7 @@ class By(Expr):
 
         return dshape(Record(list(zip(names, types))))
 
-    @property
+    @cached_property
     def dshape(self):
         # TODO: think if this should be generalized
         return var * self.schema
@@ -7,7 +7,7 @@ from __future__ import absolute_import, division, print_function
 
 import datashape
 from datashape.predicates import isscalar, iscollection, isrecord
-from .expressions import Symbol
+from .expressions import Symbol, _parse_dshape
 from ..compatibility import _strtypes
 
 __all__ = ['TableSymbol']
@@ -30,7 +30,7 @@ def TableSymbol(name, dshape):
     a single row, called a schema.
     """
     if isinstance(dshape, _strtypes):
-        dshape = datashape.dshape(dshape)
+        dshape = _parse_dshape(dshape)
     if not iscollection(dshape):
         dshape = datashape.var * dshape
     return Symbol(name, dshape)
@@ -23,3 +23,21 @@ def test_relations_maintain_shape():
 
 def test_relations_are_boolean():
     assert Gt(x, y).schema == dshape('bool')
+
+def test_operators_use_dshape_methods():
+    c = Symbol('c', 'bool')
+    assert isinstance(a + 1, Add)
+    assert isinstance(1 - a, Sub)
+    assert isinstance(a / 2, Div)
+    assert isinstance(-a, USub)
+    assert isinstance(~c, Not)
+    assert isinstance(a != 1, Ne)
+    assert isinstance(c & c, And)
+    assert (a + 1).isidentical(a._add(1))
+
+def test_measures_are_not_reparsed():
+    assert Add(x, y).dshape == dshape('5 * 3 * real')
+    assert Not(b).dshape == dshape('5 * 3 * bool')
+    assert sin(a).dshape == dshape('real')
+    assert isnan(a).dshape == dshape('bool')
+    assert sin(a).dshape is cos(x).dshape
@@ -9,3 +9,46 @@ def test_merge():
 
     assert set(expr.fields) == set(['name', 'y'])
     assert expr.y.isidentical(e.x.label('y'))
+
+
+def test_cached_schemas_match_fresh_ones():
+    t = Symbol('t', 'var * {name: string, amount: int}')
+    s = Symbol('s', 'var * {name: string, id: int}')
+    j = join(t, s, how='left')
+    for _ in range(2):  # the second pass reads the cached values
+        assert j.schema == Join.schema.func(j)
+        assert j.dshape == Join.dshape.func(j)
+    assert str(j.schema) == str(join(t, s, how='left').schema)
+
+    m = merge(t.name, t.amount + 1)
+    for _ in range(2):
+        assert m.schema == Merge.schema.func(m)
+
+
+def test_subterms_of_merge_and_union():
+    from blaze.expr.core import subterms
+    t = Symbol('t', 'var * {name: string, amount: int}')
+    s = Symbol('s', 'var * {name: string, amount: int}')
+    m = merge(t.name, t.amount + 1)
+    assert [str(x) for x in m._subterms()][1:] == \
+            ['t.name', 't', 't.amount + 1', 't']
+
+    u = union(t, s)
+    assert len(u._subterms()) == 3
+    for a, b in zip(u._subterms(), [u, t, s]):
+        assert a.isidentical(b)
+
+    for e in [m, u]:
+        fresh = [e] + [x for c in e.children for x in subterms(c)]
+        for _ in range(2):
+            assert list(map(str, e._subterms())) == list(map(str, fresh))
+
+
+def test_contains_searches_subterms():
+    t = Symbol('t', 'var * {name: string, amount: int}')
+    s = Symbol('s', 'var * {name: string, amount: int}')
+    m = merge(t.name, t.amount + 1)
+    assert t in m
+    assert t.name in m
+    assert s not in m
+    assert s in union(t, s)
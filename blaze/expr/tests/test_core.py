@@ -38,3 +38,43 @@ def test_path():
     expr = join(t, v).amount
     assert list(path(expr, t)) == [join(t, v).amount, join(t, v), t]
     assert list(path(expr, v)) == [join(t, v).amount, join(t, v), v]
+
+
+def test_common_subexpression_of_shared_subtrees():
+    t = Symbol('t', 'var * {x: int, y: int}')
+    expr = t
+    for i in range(10):
+        expr = expr[expr.x > i]  # child and predicate both lead to t
+    assert common_subexpression(expr, t.y).isidentical(t)
+    assert common_subexpression(expr.x, expr.y).isidentical(expr)
+    assert expr._leaves() == [t]
+
+
+def test_cached_subterms_and_leaves_match_a_fresh_walk():
+    from toolz import concat, unique
+    from blaze.expr.core import Node, subterms, _subterm_set
+
+    def walk(e):
+        yield e
+        if isinstance(e, Node):
+            for i in e._inputs:
+                for x in walk(i):
+                    yield x
+
+    def leaves(e):
+        if not e._inputs:
+            return [e]
+        return list(unique(concat(leaves(i) for i in e._inputs
+                                  if isinstance(i, Node))))
+
+    t = Symbol('t', 'var * {id: int, x: int}')
+    v = Symbol('v', 'var * {id: int, y: int}')
+    nested = t
+    for i in range(5):
+        nested = nested[nested.x > i]
+    for e in [t, t.x + 1, join(t, v).y.sum(), by(t.id, t.x.sum()), nested]:
+        for _ in range(2):  # the second pass reads the cached values
+            assert list(map(str, subterms(e))) == list(map(str, walk(e)))
+            assert sorted(map(str, _subterm_set(e))) == \
+                    sorted(set(map(str, walk(e))))
+            assert list(map(str, e._leaves())) == list(map(str, leaves(e)))
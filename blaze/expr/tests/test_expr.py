@@ -8,6 +8,9 @@ def test_Symbol():
     assert e.dshape == dshape('3 * 5 * {name: string, amount: int}')
     assert e.shape == (3, 5)
     assert str(e) == 'e'
+    assert e.schema == dshape('{name: string, amount: int}')
+    assert e.schema is e.schema
+    assert Symbol('f', '3 * 5 * {name: string, amount: int}').dshape is e.dshape
 
 def test_Field():
     e = Symbol('e', '3 * 5 * {name: string, amount: int}')
@@ -42,6 +45,10 @@ def test_dir():
     assert 'isnan' in dir(e.x)
     assert 'isnan' not in dir(e.amount)
 
+    f = Symbol('f', 'var * {a: ?float32, b: string}')
+    assert 'isnan' in dir(f.a)
+    assert 'isnan' not in dir(f.b)
+
 
 def test_label():
     e = Symbol('e', '3 * int')
@@ -54,3 +61,22 @@ def test_fields_with_spaces():
     e = Symbol('e', '{x: int, "a b": int}')
     assert isinstance(e['a b'], Field)
     assert 'a b' not in dir(e)
+
+
+def test_field_lookups_are_cached():
+    e = Symbol('e', 'var * {name: string, amount: int}')
+    assert e._field_names == ('name', 'amount')
+    for _ in range(2):  # the second pass reads the cached values
+        assert e._field_names == tuple(e.dshape.measure.names)
+        assert e._field_types == dict(e.dshape.measure.fields)
+    assert e._field_types['amount'] == dshape('int32')[0]
+    assert e.amount.dshape == dshape('var * int32')
+    assert e[['amount']].schema == dshape('{amount: int32}')
+
+
+def test_methods_are_cached():
+    t = Symbol('t', 'var * {name: string, amount: int32}')
+    for _ in range(2):
+        assert t.amount._methods == type(t.amount)._methods.func(t.amount)
+    assert 'sum' in t.amount._methods
+    assert 'sum' not in t.name._methods
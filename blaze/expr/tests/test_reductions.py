@@ -26,8 +26,24 @@ def test_summary_keepdims():
             dshape('1 * 1 * {a: float32, b: float32}')
 
 
+def test_summary_sorts_names_with_values():
+    x = Symbol('x', '5 * 3 * float32')
+    s = summary(b=x.max(), a=x.min())
+    assert s.names == ('a', 'b')
+    assert s.values[0].isidentical(x.min())
+    assert s.values[1].isidentical(x.max())
+
+
 def test_axis_kwarg_is_normalized_to_tuple():
     x = Symbol('x', '5 * 3 * float32')
     exprs = [x.sum(), x.sum(axis=1), x.sum(axis=[1]), x.std(), x.mean(axis=1)]
     for expr in exprs:
         assert isinstance(expr.axis, tuple)
+
+
+def test_reductions_pass_through_column_type():
+    t = Symbol('t', 'var * {amount: int64}')
+    for expr in [sum(t), min(t), max(t), t.amount.sum()]:
+        for _ in range(2):  # the second pass reads the cached dshape
+            assert expr.dshape == dshape('int64')
+    assert t.amount.mean().dshape == dshape('float64')
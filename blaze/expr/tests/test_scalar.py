@@ -2,7 +2,8 @@ from __future__ import absolute_import, division, print_function
 
 import sys
 
-from blaze.expr.arithmetic import (scalar_coerce, Mult, Add, dshape)
+from blaze.expr.arithmetic import (scalar_coerce, Mult, Add, Div, Pow,
+                                   dshape)
 from blaze.expr.math import sin, cos, isnan, exp, log
 from blaze.expr import Symbol, eval_str, exprify
 from blaze.compatibility import xfail, basestring, raises
@@ -141,6 +142,14 @@ class TestExprify(object):
         assert exprify('1 // y // x', self.dtypes).isidentical(
             1 // self.y // self.x)
 
+    def test_constants_are_folded(self):
+        assert exprify('2 * 3 + x', self.dtypes).isidentical(6 + self.x)
+        assert exprify('x - (1 + 1)', self.dtypes).isidentical(self.x - 2)
+        assert exprify('-(2 * 3)', {}) == -6
+        assert exprify('1 < 2', {}) is True
+        assert isinstance(exprify('1 / 0', {}), Div)
+        assert isinstance(exprify('2 ** 3', {}), Pow)
+
     def test_comparison(self):
         other = (self.x == 1) | (self.x == 2)
         assert exprify('(x == 1) | (x == 2)', self.dtypes).isidentical(other)
@@ -286,6 +286,14 @@ def test_join_different_on_right_left_columns():
     assert j.on_right == 'a'
 
 
+def test_join_stores_columns_as_tuples():
+    t = TableSymbol('t', '{x: int, y: int}')
+    s = TableSymbol('s', '{x: int, y: int}')
+    assert join(t, s, ['x', 'y'])._on_left == ('x', 'y')
+    assert join(t, s, ('x', 'y'))._on_right == ('x', 'y')
+    assert join(t, s, 'x')._on_left == 'x'
+
+
 def test_joined_column_first_in_schema():
     t = TableSymbol('t', '{x: int, y: int, z: int}')
     s = TableSymbol('s', '{w: int, y: int}')
@@ -293,6 +301,14 @@ def test_joined_column_first_in_schema():
     assert join(t, s).schema == dshape('{y: int, x: int, z: int, w: int}')
 
 
+def test_join_schema_keeps_left_column_order():
+    t = TableSymbol('t', '{a: int, x: int, b: int, y: int}')
+    s = TableSymbol('s', '{y: int, c: int, x: int}')
+
+    assert join(t, s, ['x', 'y']).schema == \
+            dshape('{x: int, y: int, a: int, b: int, c: int}')
+
+
 def test_outer_join():
     t = TableSymbol('t', '{name: string, amount: int}')
     s = TableSymbol('t', '{name: string, id: int}')
@@ -612,6 +628,15 @@ def test_apply():
         l.dshape
 
 
+def test_map_and_apply_parse_their_datashape_once():
+    t = TableSymbol('t', '{name: string, amount: int32, id: int32}')
+    inc = lambda x: x + 1
+    m = t['amount'].map(inc, schema='{amount: int}')
+    assert m.schema is t['id'].map(inc, schema='{amount: int}').schema
+    s = Apply(t['amount'], sum, dshape='3 * real')
+    assert s.dshape is Apply(t['id'], sum, dshape='3 * real').dshape
+
+
 def test_broadcast():
     from blaze.expr.arithmetic import Add, Eq, Mult, Le
     t = TableSymbol('t', '{x: int, y: int, z: int}')
@@ -680,6 +705,13 @@ def test_merge_repeats():
                            '{name: string, balance: int32, id: int32}')
     with pytest.raises(ValueError):
         merge(accounts, (accounts.balance + 1).label('balance'))
+    try:
+        merge(accounts, accounts.id, accounts.balance, accounts.id)
+    except ValueError as e:
+        assert 'balance' in str(e) and 'id' in str(e)
+        assert 'name' not in str(e)
+    else:
+        assert False
 
 
 def test_merge_project():